@@ -9,7 +9,7 @@ from contextlib import asynccontextmanager
 from decimal import Decimal
 from typing import AsyncGenerator, Optional
 
-from fastapi import FastAPI, HTTPException, Request, Depends
+from fastapi import FastAPI, HTTPException, Request, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import ValidationError
@@ -2360,7 +2360,7 @@ async def get_market_bars(
     timeframe: str,
     start: Optional[str] = None,
     end: Optional[str] = None,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=5000),
     rth_only: bool = True,
     broker: BrokerAdapter = Depends(get_broker)
 ):
@@ -2371,10 +2371,6 @@ async def get_market_bars(
         start_dt = datetime.fromisoformat(start.replace('Z', '+00:00')) if start else None
         end_dt = datetime.fromisoformat(end.replace('Z', '+00:00')) if end else None
         
-        # Validate limit
-        if limit < 1 or limit > 5000:
-            raise HTTPException(status_code=400, detail="Limit must be between 1 and 5000")
-        
         bars = broker.get_market_bars(
             instrument=instrument,
             timeframe=timeframe,
@@ -45,6 +45,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Optional
 
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -56,7 +57,7 @@ from packages.broker_ibkr.models import Portfolio, Instrument, InstrumentType
 from packages.kill_switch import KillSwitch, get_kill_switch
 from packages.mcp_security import validate_schema
 from packages.mcp_security.rate_limiter import get_rate_limiter, RateLimitConfig
-from packages.mcp_security.redactor import get_redactor, RedactionConfig
+from packages.mcp_security.redactor import OutputRedactor, get_redactor, RedactionConfig
 from packages.mcp_security.policy import get_policy, ToolPolicy
 from packages.mcp_security.schemas import (
     RequestApprovalSchema,
@@ -103,13 +104,34 @@ policy = None  # Initialized in main()
 logger = get_logger(__name__)
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """JSON encoder that handles Decimal types."""
+def _json_default(obj: Any) -> str:
+    """Serialize Decimal values as strings for orjson."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize a tool result to JSON text with orjson (Decimals as strings)."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, default=_json_default, option=option).decode()
+
+
+def _redact_content(result: list[TextContent], output_redactor: OutputRedactor) -> None:
+    """Redact tool output in place.
     
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return str(obj)
-        return super().default(obj)
+    JSON text goes through a stdlib json round-trip, not orjson: orjson
+    turns integers wider than 64 bits into floats and NaN into null, which
+    would change the tool output. Other text gets string redaction.
+    """
+    for content_item in result:
+        if content_item.type == "text":
+            try:
+                data = json.loads(content_item.text)
+            except json.JSONDecodeError:
+                content_item.text = output_redactor.redact(content_item.text)
+            else:
+                content_item.text = json.dumps(output_redactor.redact(data))
 
 
 def emit_audit_event(
@@ -206,7 +228,7 @@ async def handle_get_portfolio(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("get_portfolio", correlation_id, {"account_id": account_id}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_portfolio", correlation_id, arguments, error=str(e))
@@ -258,7 +280,7 @@ async def handle_get_positions(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("get_positions", correlation_id, {"account_id": account_id}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_positions", correlation_id, arguments, error=str(e))
@@ -304,7 +326,7 @@ async def handle_get_cash(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("get_cash", correlation_id, {"account_id": account_id}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_cash", correlation_id, arguments, error=str(e))
@@ -355,7 +377,7 @@ async def handle_get_open_orders(arguments: dict[str, Any]) -> list[TextContent]
         
         emit_audit_event("get_open_orders", correlation_id, {"account_id": account_id}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_open_orders", correlation_id, arguments, error=str(e))
@@ -444,7 +466,7 @@ async def handle_simulate_order(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("simulate_order", correlation_id, arguments, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("simulate_order", correlation_id, arguments, error=str(e))
@@ -530,7 +552,7 @@ async def handle_evaluate_risk(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("evaluate_risk", correlation_id, arguments, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("evaluate_risk", correlation_id, arguments, error=str(e))
@@ -572,7 +594,7 @@ async def handle_request_approval(arguments: dict[str, Any]) -> list[TextContent
                 "proposal_id": None,
             }
             emit_audit_event("request_approval", correlation_id, arguments, result)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
         
         # Parse and validate parameters
         account_id = arguments.get("account_id")
@@ -631,7 +653,7 @@ async def handle_request_approval(arguments: dict[str, Any]) -> list[TextContent
                 "proposal_id": None,
             }
             emit_audit_event("request_approval", correlation_id, arguments, result)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
         
         # Evaluate risk
         risk_decision = risk_engine.evaluate(portfolio, intent, sim_result)
@@ -645,7 +667,7 @@ async def handle_request_approval(arguments: dict[str, Any]) -> list[TextContent
                 "proposal_id": None,
             }
             emit_audit_event("request_approval", correlation_id, arguments, result)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
         
         # Risk approved - store proposal and request approval
         proposal = approval_service.store_proposal(
@@ -700,7 +722,7 @@ async def handle_request_approval(arguments: dict[str, Any]) -> list[TextContent
         
         emit_audit_event("request_approval", correlation_id, arguments, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2, cls=DecimalEncoder))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("request_approval", correlation_id, arguments, error=str(e))
@@ -740,7 +762,7 @@ async def handle_request_cancel(arguments: dict[str, Any]) -> list[TextContent]:
                 "approval_id": None,
             }
             emit_audit_event("request_cancel", correlation_id, arguments, result)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
         
         # Extract validated parameters
         account_id = arguments.get("account_id")
@@ -802,7 +824,7 @@ async def handle_request_cancel(arguments: dict[str, Any]) -> list[TextContent]:
         
         emit_audit_event("request_cancel", correlation_id, arguments, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("request_cancel", correlation_id, arguments, error=str(e))
@@ -858,7 +880,7 @@ async def handle_get_market_snapshot(arguments: dict[str, Any]) -> list[TextCont
         
         emit_audit_event("get_market_snapshot", correlation_id, {"instrument": instrument}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_market_snapshot", correlation_id, arguments, error=str(e))
@@ -943,7 +965,7 @@ async def handle_get_market_bars(arguments: dict[str, Any]) -> list[TextContent]
         
         emit_audit_event("get_market_bars", correlation_id, {"instrument": instrument, "count": len(bars)}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2, cls=DecimalEncoder))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     except Exception as e:
         logger.error(f"Error getting market bars: {e}", exc_info=True)
         emit_audit_event("get_market_bars", correlation_id, {"instrument": instrument}, error=str(e))
@@ -1010,7 +1032,7 @@ async def handle_instrument_search(arguments: dict[str, Any]) -> list[TextConten
         
         emit_audit_event("instrument_search", correlation_id, {"query": query, "count": len(candidates)}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     except Exception as e:
         logger.error(f"Error searching instruments: {e}", exc_info=True)
         emit_audit_event("instrument_search", correlation_id, {"query": arguments.get("query")}, error=str(e))
@@ -1083,7 +1105,7 @@ async def handle_instrument_resolve(arguments: dict[str, Any]) -> list[TextConte
             
             emit_audit_event("instrument_resolve", correlation_id, {"symbol": symbol, "con_id": contract.con_id}, result)
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
             
         except InstrumentResolutionError as e:
             # Return alternatives
@@ -1110,14 +1132,14 @@ async def handle_instrument_resolve(arguments: dict[str, Any]) -> list[TextConte
                 "alternatives": len(e.candidates)
             }, result)
             
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=_dumps(result, indent=True))]
             
     except Exception as e:
         logger.error(f"Error resolving instrument: {e}", exc_info=True)
         emit_audit_event("instrument_resolve", correlation_id, {"symbol": arguments.get("symbol")}, error=str(e))
         return [TextContent(type="text", text=f"Error: {e}")]
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     
     except Exception as e:
         emit_audit_event("get_market_bars", correlation_id, arguments, error=str(e))
@@ -1164,7 +1186,7 @@ async def handle_list_flex_queries(arguments: dict[str, Any]) -> list[TextConten
         
         emit_audit_event("list_flex_queries", correlation_id, {"count": response.total}, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     except Exception as e:
         logger.error(f"Error listing flex queries: {e}", exc_info=True)
         emit_audit_event("list_flex_queries", correlation_id, {}, error=str(e))
@@ -1260,7 +1282,7 @@ async def handle_run_flex_query(arguments: dict[str, Any]) -> list[TextContent]:
             "trades": len(query_result.trades),
         }, result)
         
-        return [TextContent(type="text", text=json.dumps(result, indent=2, cls=DecimalEncoder))]
+        return [TextContent(type="text", text=_dumps(result, indent=True))]
     except Exception as e:
         logger.error(f"Error running flex query: {e}", exc_info=True)
         emit_audit_event("run_flex_query", correlation_id, {"query_id": arguments.get("query_id")}, error=str(e))
@@ -1631,10 +1653,10 @@ async def main():
                 data={"tool_name": name, "reason": error_msg}
             ))
             
-            return [TextContent(type="text", text=json.dumps({
+            return [TextContent(type="text", text=_dumps({
                 "error": error_msg,
                 "tool": name
-            }, cls=DecimalEncoder))]
+            }))]
         
         # 2. Rate limit check
         rate_allowed, rate_reason = rate_limiter.check_rate_limit(name, session_id)
@@ -1652,11 +1674,11 @@ async def main():
                 data={"tool_name": name, "reason": error_msg}
             ))
             
-            return [TextContent(type="text", text=json.dumps({
+            return [TextContent(type="text", text=_dumps({
                 "error": error_msg,
                 "tool": name,
                 "retry_after": rate_reason  # Contains seconds if circuit breaker active
-            }, cls=DecimalEncoder))]
+            }))]
         
         # 3. Execute tool (existing routing)
         try:
@@ -1695,17 +1717,7 @@ async def main():
             policy.record_tool_call(name, session_id)
             
             # 5. Redact sensitive data from output
-            # Parse JSON, redact, re-serialize
-            for content_item in result:
-                if content_item.type == "text":
-                    try:
-                        # Try to parse as JSON and redact
-                        data = json.loads(content_item.text)
-                        redacted_data = redactor.redact(data)
-                        content_item.text = json.dumps(redacted_data, cls=DecimalEncoder)
-                    except json.JSONDecodeError:
-                        # Plain text, apply string redaction
-                        content_item.text = redactor.redact(content_item.text)
+            _redact_content(result, redactor)
             
             return result
             
@@ -1723,10 +1735,10 @@ async def main():
                 data={"tool_name": name, "error": str(e)}
             ))
             
-            return [TextContent(type="text", text=json.dumps({
+            return [TextContent(type="text", text=_dumps({
                 "error": error_msg,
                 "tool": name
-            }, cls=DecimalEncoder))]
+            }))]
     
     # Run server
     logger.info("mcp_server_starting", transport="stdio")
@@ -5,14 +5,19 @@ This module provides append-only storage for audit events with efficient queryin
 """
 
 import json
+import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Sequence
 
 from .models import AuditEvent, AuditEventCreate, AuditQuery, AuditStats, EventType
 
+# stdlib logging: structured_logging imports this package
+logger = logging.getLogger(__name__)
+
 
 class AuditStore:
     """
@@ -21,19 +26,62 @@ class AuditStore:
     Thread-safe for concurrent writes. Events cannot be modified or deleted.
     """
 
-    def __init__(self, db_path: str | Path = "audit.db") -> None:
+    def __init__(
+        self,
+        db_path: str | Path = "audit.db",
+        flush_threshold: int = 1,
+        wal: bool = False,
+    ) -> None:
         """
         Initialize audit store.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a
+                non-durable in-memory database (e.g. in tests)
+            flush_threshold: Number of appended events to buffer before
+                writing them in one transaction. The default of 1 writes
+                every event immediately; larger values trade durability of
+                the last few events for far fewer commits. Buffered events
+                are flushed before every read, by flush() and by close().
+                A failed flush raises and drops the buffered events.
+            wal: Use WAL journaling with synchronous=NORMAL for a file-backed
+                store. Commits get much cheaper and readers no longer block
+                writers, but a power loss can drop the latest commits. Off by
+                default, keeping full durability; ignored for ":memory:".
+
+        Raises:
+            ValueError: If flush_threshold is less than 1
         """
+        if flush_threshold < 1:
+            raise ValueError("flush_threshold must be at least 1")
+
         self.db_path = Path(db_path)
+        self._memory = str(db_path) == ":memory:"
+        self._memory_conn: sqlite3.Connection | None = None
+        self._memory_lock = threading.RLock()
+        self._flush_threshold = flush_threshold
+        self._wal = wal and not self._memory
+        self._buffer: list[tuple[str, ...]] = []
+        self._buffer_lock = threading.Lock()
+
+        if self._memory:
+            # Every connection to ":memory:" opens a separate empty database, so
+            # the store holds one connection for its lifetime. Threads share it
+            # behind _memory_lock; a shared-cache database would instead fail
+            # concurrent writers with SQLITE_LOCKED.
+            self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._memory_conn.row_factory = sqlite3.Row
+
         self._init_db()
 
     def _init_db(self) -> None:
         """Create database schema if it doesn't exist."""
         with self._get_connection() as conn:
+            if self._wal:
+                # WAL is a persistent property of the database file; it lets
+                # readers proceed during writes and makes commits cheaper
+                conn.execute("PRAGMA journal_mode=WAL")
+
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS audit_events (
                     id TEXT PRIMARY KEY,
@@ -66,16 +114,115 @@ class AuditStore:
 
             conn.commit()
 
+    def reset(self) -> None:
+        """
+        Remove all events from an in-memory store.
+
+        Intended for tests that share one ":memory:" store across cases.
+        File-backed stores stay append-only.
+
+        Raises:
+            RuntimeError: If the store is not in-memory
+        """
+        if not self._memory:
+            raise RuntimeError("Only in-memory audit stores can be reset")
+
+        with self._buffer_lock:
+            self._buffer.clear()
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM audit_events")
+                conn.commit()
+
+    def close(self) -> None:
+        """
+        Flush buffered events and release the store's resources.
+
+        For a ":memory:" store this closes its connection, discarding the
+        events. Also called on leaving a
+        ``with AuditStore(...)`` block.
+
+        Raises:
+            RuntimeError: If the buffered events cannot be persisted
+        """
+        try:
+            self.flush()
+        finally:
+            with self._memory_lock:
+                if self._memory_conn is not None:
+                    self._memory_conn.close()
+                    self._memory_conn = None
+
+    def __enter__(self) -> "AuditStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     @contextmanager
     def _get_connection(self) -> Iterator[sqlite3.Connection]:
         """Get database connection with proper error handling."""
+        if self._memory:
+            with self._memory_lock:
+                if self._memory_conn is None:
+                    raise RuntimeError("Audit store is closed")
+                try:
+                    yield self._memory_conn
+                except BaseException:
+                    # The connection outlives this block; drop a failed write
+                    self._memory_conn.rollback()
+                    raise
+            return
+
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
+        if self._wal:
+            # Safe with WAL: a power loss can only drop the latest commits
+            conn.execute("PRAGMA synchronous=NORMAL")
         try:
             yield conn
         finally:
             conn.close()
 
+    _INSERT_SQL = """
+        INSERT INTO audit_events 
+        (id, event_type, correlation_id, timestamp, data, metadata, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _build_event(event_create: AuditEventCreate) -> AuditEvent:
+        """Create the full event with generated ID and timestamp."""
+        return AuditEvent(
+            event_type=event_create.event_type,
+            correlation_id=event_create.correlation_id,
+            data=event_create.data,
+            metadata=event_create.metadata,
+        )
+
+    @staticmethod
+    def _event_row(event: AuditEvent) -> tuple[str, ...]:
+        """
+        Convert an event to its INSERT parameters.
+
+        Raises:
+            RuntimeError: If the event payload is not JSON serializable
+        """
+        try:
+            data = json.dumps(event.data)
+            metadata = json.dumps(event.metadata)
+        except (TypeError, ValueError) as e:
+            raise RuntimeError(f"Failed to append audit event: {e}") from e
+
+        return (
+            str(event.id),
+            event.event_type.value,
+            event.correlation_id,
+            event.timestamp.isoformat(),
+            data,
+            metadata,
+            datetime.utcnow().isoformat(),
+        )
+
     def append_event(self, event_create: AuditEventCreate) -> AuditEvent:
         """
         Append a new audit event to the store.
@@ -89,37 +236,103 @@ class AuditStore:
         Raises:
             RuntimeError: If event cannot be persisted
         """
-        # Create full event with generated fields
-        event = AuditEvent(
-            event_type=event_create.event_type,
-            correlation_id=event_create.correlation_id,
-            data=event_create.data,
-            metadata=event_create.metadata,
-        )
+        event = self._build_event(event_create)
+        row = self._event_row(event)
+
+        if self._flush_threshold == 1:
+            self._write_rows([row])
+            return event
+
+        with self._buffer_lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self._flush_threshold:
+                self._flush_locked()
+
+        return event
+
+    def flush(self) -> None:
+        """
+        Write any buffered events in a single transaction.
+
+        Only needed when the store was created with flush_threshold > 1.
+
+        Raises:
+            RuntimeError: If the buffered events cannot be persisted
+        """
+        if not self._buffer:
+            return
 
+        with self._buffer_lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write and clear the buffer (caller holds the buffer lock)."""
+        if not self._buffer:
+            return
+
+        self._write_buffered(self._buffer)
+
+    def _write_buffered(self, rows: list[tuple[str, ...]]) -> None:
+        """
+        Write rows that include the buffer, then clear it (caller holds the lock).
+
+        The buffer is cleared even if the write fails, so a persistent
+        database error cannot grow it without bound; the dropped events are
+        logged and the error is raised to the caller.
+
+        Raises:
+            RuntimeError: If the rows cannot be persisted
+        """
+        try:
+            self._write_rows(rows)
+        except RuntimeError:
+            logger.error("Dropped %d audit events after a failed write", len(rows))
+            raise
+        finally:
+            self._buffer.clear()
+
+    def _write_rows(self, rows: Sequence[tuple[str, ...]]) -> None:
+        """
+        Insert rows with one executemany and a single commit.
+
+        Raises:
+            RuntimeError: If the rows cannot be persisted
+        """
         try:
             with self._get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO audit_events 
-                    (id, event_type, correlation_id, timestamp, data, metadata, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        str(event.id),
-                        event.event_type.value,
-                        event.correlation_id,
-                        event.timestamp.isoformat(),
-                        json.dumps(event.data),
-                        json.dumps(event.metadata),
-                        datetime.utcnow().isoformat(),
-                    ),
-                )
+                conn.executemany(self._INSERT_SQL, rows)
                 conn.commit()
         except Exception as e:
-            raise RuntimeError(f"Failed to append audit event: {e}") from e
+            raise RuntimeError(f"Failed to append audit events: {e}") from e
 
-        return event
+    def append_events(self, event_creates: Sequence[AuditEventCreate]) -> list[AuditEvent]:
+        """
+        Append several audit events in a single transaction.
+
+        Uses one connection, one executemany and one commit instead of paying
+        that overhead per event. Either all events are stored or none are.
+
+        Args:
+            event_creates: Event data to append, in order
+
+        Returns:
+            The created audit events, in the same order
+
+        Raises:
+            RuntimeError: If the events cannot be persisted
+        """
+        events = [self._build_event(event_create) for event_create in event_creates]
+        if not events:
+            return events
+
+        rows = [self._event_row(e) for e in events]
+
+        # Write anything buffered earlier in the same transaction, ahead of
+        # these rows, so insertion order holds
+        with self._buffer_lock:
+            self._write_buffered(self._buffer + rows)
+
+        return events
 
     def get_event(self, event_id: str) -> AuditEvent | None:
         """
@@ -131,6 +344,8 @@ class AuditStore:
         Returns:
             The event if found, None otherwise
         """
+        self.flush()
+
         with self._get_connection() as conn:
             row = conn.execute(
                 "SELECT * FROM audit_events WHERE id = ?", (event_id,)
@@ -141,6 +356,51 @@ class AuditStore:
 
             return self._row_to_event(row)
 
+    @property
+    def last_event(self) -> AuditEvent | None:
+        """
+        Most recently appended event.
+
+        Reads the tail of the table by rowid (insertion order), so the cost
+        does not grow with the number of stored events.
+
+        Returns:
+            The last appended event, or None if the store is empty
+        """
+        self.flush()
+
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM audit_events ORDER BY rowid DESC LIMIT 1"
+            ).fetchone()
+
+            if not row:
+                return None
+
+            return self._row_to_event(row)
+
+    def events_for(self, correlation_id: str) -> list[AuditEvent]:
+        """
+        Retrieve all events sharing a correlation ID.
+
+        Served directly by the correlation_id index, without the filter
+        building and pagination of query_events.
+
+        Args:
+            correlation_id: Correlation ID to look up
+
+        Returns:
+            Matching events in chronological order
+        """
+        self.flush()
+
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM audit_events WHERE correlation_id = ? ORDER BY timestamp, rowid",
+                (correlation_id,),
+            ).fetchall()
+            return [self._row_to_event(row) for row in rows]
+
     def query_events(self, query: AuditQuery) -> list[AuditEvent]:
         """
         Query audit events with filters.
@@ -151,6 +411,8 @@ class AuditStore:
         Returns:
             List of matching events, ordered by timestamp descending
         """
+        self.flush()
+
         conditions = []
         params: list[str | int] = []
 
@@ -191,6 +453,8 @@ class AuditStore:
         Returns:
             Statistics summary
         """
+        self.flush()
+
         with self._get_connection() as conn:
             # Total events
             total = conn.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0]
@@ -6,7 +6,7 @@ for testing purposes without connecting to real IBKR.
 
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional, TYPE_CHECKING, List
+from typing import Any, Optional, TYPE_CHECKING, List
 import uuid
 import random
 import math
@@ -44,6 +44,61 @@ from .models import (
 )
 
 
+# Most recent explicit bar windows kept per adapter
+_BARS_CACHE_SIZE = 256
+
+
+def _generate_bars(
+    instrument: str,
+    timeframe: TimeframeType,
+    timeframe_minutes: int,
+    base_price: Decimal,
+    start: datetime,
+    end: datetime,
+    limit: int,
+) -> tuple[MarketBar, ...]:
+    """Generate simulated OHLCV bars for a resolved time window."""
+    bars = []
+    current_price = base_price
+    current_time = start
+    
+    while current_time < end and len(bars) < limit:
+        # Simulate price movement with trend + noise
+        trend = random.uniform(-0.002, 0.002)  # ±0.2% trend
+        volatility = float(base_price) * 0.01  # 1% volatility
+        
+        # Generate OHLC
+        open_price = current_price
+        high = open_price + Decimal(str(abs(random.gauss(0, volatility))))
+        low = open_price - Decimal(str(abs(random.gauss(0, volatility))))
+        close = open_price * (Decimal("1") + Decimal(str(trend)))
+        
+        # Ensure OHLC relationships
+        high = max(high, open_price, close)
+        low = min(low, open_price, close)
+        
+        volume = random.randint(10000, 500000)
+        
+        bars.append(MarketBar(
+            instrument=instrument,
+            timestamp=current_time,
+            timeframe=timeframe,
+            open=open_price,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            vwap=(open_price + high + low + close) / Decimal("4"),
+            trade_count=random.randint(100, 5000),
+        ))
+        
+        # Move to next bar
+        current_price = close
+        current_time += timedelta(minutes=timeframe_minutes)
+    
+    return tuple(bars)
+
+
 class FakeBrokerAdapter:
     """Fake broker adapter for testing.
 
@@ -64,6 +119,8 @@ class FakeBrokerAdapter:
         self._open_orders: list[OpenOrder] = []
         self._submitted_orders: dict[str, OpenOrder] = {}  # broker_order_id -> order
         self._instrument_db: dict[int, InstrumentContract] = self._create_mock_instruments()
+        # Generated bars per explicit window, so repeated requests match
+        self._bars_cache: dict[tuple, tuple[MarketBar, ...]] = {}
 
     def connect(self) -> None:
         """Simulate connection."""
@@ -167,6 +224,34 @@ class FakeBrokerAdapter:
     def clear_mock_orders(self) -> None:
         """Clear all mock orders."""
         self._open_orders.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Capture mutable account state for a later restore().
+
+        Positions, cash and orders are frozen models, so shallow copies
+        of the containers are enough.
+
+        Returns:
+            Opaque state snapshot.
+        """
+        return {
+            "positions": list(self._positions),
+            "cash": list(self._cash),
+            "open_orders": list(self._open_orders),
+            "submitted_orders": dict(self._submitted_orders),
+        }
+
+    def restore(self, snapshot: dict[str, Any]) -> None:
+        """Restore account state captured by snapshot().
+
+        Args:
+            snapshot: State returned by snapshot().
+        """
+        self._positions = list(snapshot["positions"])
+        self._cash = list(snapshot["cash"])
+        self._open_orders = list(snapshot["open_orders"])
+        self._submitted_orders = dict(snapshot["submitted_orders"])
+
     def submit_order(
         self,
         order_intent: "OrderIntent",
@@ -397,6 +482,9 @@ class FakeBrokerAdapter:
         # Parse timeframe
         timeframe_minutes = self._parse_timeframe(timeframe)
         
+        # Only windows with an explicit end repeat, so only those are cached
+        cacheable = end is not None
+        
         # Default time range
         if end is None:
             end = datetime.utcnow()
@@ -407,47 +495,26 @@ class FakeBrokerAdapter:
         max_possible_bars = int((end - start).total_seconds() / 60 / timeframe_minutes)
         actual_limit = min(limit, max_possible_bars, 1000)  # Cap at 1000 for safety
         
-        # Generate bars
-        bars = []
-        base_price = self._get_mock_price(instrument)
-        current_price = base_price
-        current_time = start
-        
-        while current_time < end and len(bars) < actual_limit:
-            # Simulate price movement with trend + noise
-            trend = random.uniform(-0.002, 0.002)  # ±0.2% trend
-            volatility = float(base_price) * 0.01  # 1% volatility
-            
-            # Generate OHLC
-            open_price = current_price
-            high = open_price + Decimal(str(abs(random.gauss(0, volatility))))
-            low = open_price - Decimal(str(abs(random.gauss(0, volatility))))
-            close = open_price * (Decimal("1") + Decimal(str(trend)))
-            
-            # Ensure OHLC relationships
-            high = max(high, open_price, close)
-            low = min(low, open_price, close)
-            
-            volume = random.randint(10000, 500000)
-            
-            bars.append(MarketBar(
-                instrument=instrument,
-                timestamp=current_time,
-                timeframe=timeframe,
-                open=open_price,
-                high=high,
-                low=low,
-                close=close,
-                volume=volume,
-                vwap=(open_price + high + low + close) / Decimal("4"),
-                trade_count=random.randint(100, 5000),
-            ))
-            
-            # Move to next bar
-            current_price = close
-            current_time += timedelta(minutes=timeframe_minutes)
+        key = (instrument, timeframe, start, end, actual_limit)
+        bars = self._bars_cache.get(key) if cacheable else None
+        if bars is None:
+            bars = _generate_bars(
+                instrument,
+                timeframe,
+                timeframe_minutes,
+                self._get_mock_price(instrument),
+                start,
+                end,
+                actual_limit,
+            )
+            if cacheable:
+                if len(self._bars_cache) >= _BARS_CACHE_SIZE:
+                    # Evict the oldest window (dicts keep insertion order)
+                    del self._bars_cache[next(iter(self._bars_cache))]
+                self._bars_cache[key] = bars
         
-        return bars
+        # MarketBar is mutable: hand out copies so callers can't alter the cache
+        return [bar.model_copy() for bar in bars]
     
     def _parse_timeframe(self, timeframe: TimeframeType) -> int:
         """Parse timeframe string to minutes.
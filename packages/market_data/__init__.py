@@ -86,7 +86,7 @@ class CachedMarketData:
     Cached market data with timestamp and TTL.
     """
     
-    def __init__(self, data: MarketSnapshot | List[MarketBar], ttl_seconds: int):
+    def __init__(self, data: MarketSnapshot | List[MarketBar], ttl_seconds: float):
         self.data = data
         self.cached_at = time.time()
         self.ttl_seconds = ttl_seconds
@@ -110,15 +110,15 @@ class MarketDataCache:
     
     def __init__(
         self,
-        snapshot_ttl_seconds: int = 5,
-        bars_ttl_seconds: int = 300,
+        snapshot_ttl_seconds: float = 5,
+        bars_ttl_seconds: float = 300,
         max_cache_size: int = 1000
     ):
         """
         Initialize market data cache.
         
         Args:
-            snapshot_ttl_seconds: TTL for snapshot data (default: 5s)
+            snapshot_ttl_seconds: TTL for snapshot data (default: 5s, fractions allowed)
             bars_ttl_seconds: TTL for bar data (default: 300s = 5 min)
             max_cache_size: Maximum number of cached entries
         """
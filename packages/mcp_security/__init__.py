@@ -42,12 +42,15 @@ def validate_schema(schema_class: type[BaseModel]) -> Callable[[F], F]:
     Returns:
         Decorated function with validation
     """
+    # Resolve the core validator once at decoration time, not per call
+    validator = schema_class.__pydantic_validator__
+    
     def decorator(func: F) -> F:
         @functools.wraps(func)
         async def wrapper(arguments: dict[str, Any], *args, **kwargs):
             try:
                 # Validate with Pydantic (extra='forbid' prevents unknown fields)
-                validated = schema_class.model_validate(arguments, strict=True)
+                validator.validate_python(arguments, strict=True)
                 
                 logger.debug(
                     f"Tool {func.__name__} validation passed",
@@ -64,7 +67,7 @@ def validate_schema(schema_class: type[BaseModel]) -> Callable[[F], F]:
             except ValidationError as e:
                 # Format validation errors
                 errors = []
-                for error in e.errors():
+                for error in e.errors(include_url=False, include_input=False):
                     field = ".".join(str(x) for x in error["loc"])
                     msg = error["msg"]
                     errors.append(f"{field}: {msg}")
@@ -81,15 +84,18 @@ def validate_schema(schema_class: type[BaseModel]) -> Callable[[F], F]:
                     }
                 )
                 
-                # Return error response in MCP format
+                # Return error response in MCP format. validation_errors is
+                # serialized by pydantic-core (without echoing inputs) and
+                # spliced in rather than re-encoded through json.dumps.
                 from mcp.types import TextContent
                 return [TextContent(
                     type="text",
-                    text=json.dumps({
-                        "error": error_msg,
-                        "validation_errors": errors,
-                        "status": "VALIDATION_ERROR"
-                    }, indent=2)
+                    text=(
+                        '{"error": ' + json.dumps(error_msg)
+                        + ', "validation_errors": '
+                        + e.json(include_url=False, include_input=False)
+                        + ', "status": "VALIDATION_ERROR"}'
+                    )
                 )]
                 
         return wrapper  # type: ignore
@@ -147,6 +153,37 @@ class StrictBaseModel(BaseModel):
     }
 
 
+# Allowlist of MCP tools, in display order
+_ALLOWED_TOOLS: tuple[str, ...] = (
+    # Read-only broker tools
+    "get_portfolio",
+    "get_positions",
+    "get_market_snapshot",
+    "get_broker_status",
+    
+    # Read-only flex query tools
+    "list_flex_queries",
+    "run_flex_query",
+    
+    # Risk/simulation tools (read-only)
+    "simulate_order",
+    "evaluate_risk",
+    
+    # ONLY write tool (gated)
+    "request_approval",
+    
+    # System tools
+    "kill_switch_status",
+)
+
+# Constant-time membership checks on the per-call path
+_ALLOWED_TOOL_SET: frozenset[str] = frozenset(_ALLOWED_TOOLS)
+
+_WRITE_TOOLS: frozenset[str] = frozenset({
+    "request_approval",  # Only allowed write tool
+})
+
+
 def list_allowed_tools() -> list[str]:
     """
     Return list of allowed MCP tools (allowlist).
@@ -157,27 +194,7 @@ def list_allowed_tools() -> list[str]:
     Returns:
         List of allowed tool names
     """
-    return [
-        # Read-only broker tools
-        "get_portfolio",
-        "get_positions",
-        "get_market_snapshot",
-        "get_broker_status",
-        
-        # Read-only flex query tools
-        "list_flex_queries",
-        "run_flex_query",
-        
-        # Risk/simulation tools (read-only)
-        "simulate_order",
-        "evaluate_risk",
-        
-        # ONLY write tool (gated)
-        "request_approval",
-        
-        # System tools
-        "kill_switch_status",
-    ]
+    return list(_ALLOWED_TOOLS)
 
 
 def is_write_tool(tool_name: str) -> bool:
@@ -193,10 +210,7 @@ def is_write_tool(tool_name: str) -> bool:
     Returns:
         True if tool performs writes, False otherwise
     """
-    write_tools = {
-        "request_approval",  # Only allowed write tool
-    }
-    return tool_name in write_tools
+    return tool_name in _WRITE_TOOLS
 
 
 def validate_tool_allowlist(tool_name: str) -> tuple[bool, str | None]:
@@ -209,9 +223,7 @@ def validate_tool_allowlist(tool_name: str) -> tuple[bool, str | None]:
     Returns:
         Tuple of (is_allowed, error_message)
     """
-    allowed = list_allowed_tools()
-    
-    if tool_name not in allowed:
-        return False, f"Tool '{tool_name}' not in allowlist. Allowed tools: {', '.join(allowed)}"
+    if tool_name not in _ALLOWED_TOOL_SET:
+        return False, f"Tool '{tool_name}' not in allowlist. Allowed tools: {', '.join(_ALLOWED_TOOLS)}"
     
     return True, None
@@ -8,7 +8,7 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import AbstractSet, Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from packages.structured_logging import get_logger
 
@@ -23,16 +23,29 @@ class ToolAction(str, Enum):
     REQUIRE_APPROVAL = "require_approval"  # Future: explicit user approval UI
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolPolicyRule:
-    """Policy rule for a specific tool."""
+    """Policy rule for a specific tool.
+    
+    Frozen: ToolPolicy derives lookup tables from its rules when it is built,
+    so a rule must not change afterwards.
+    """
     
     tool_name: str
     action: ToolAction
-    allowed_sessions: Set[str] | None = None  # None = all sessions
+    allowed_sessions: AbstractSet[str] | None = None  # None = all sessions
     max_calls_per_session: int | None = None  # None = unlimited
-    allowed_parameters: Set[str] | None = None  # None = all parameters
-    denied_parameters: Set[str] | None = None  # Empty = allow all
+    allowed_parameters: AbstractSet[str] | None = None  # None = all parameters
+    denied_parameters: AbstractSet[str] | None = None  # Empty = allow all
+    
+    def __post_init__(self) -> None:
+        """Freeze session and parameter sets once so per-call checks are pure set algebra."""
+        if self.allowed_sessions is not None:
+            object.__setattr__(self, "allowed_sessions", frozenset(self.allowed_sessions))
+        if self.allowed_parameters is not None:
+            object.__setattr__(self, "allowed_parameters", frozenset(self.allowed_parameters))
+        if self.denied_parameters is not None:
+            object.__setattr__(self, "denied_parameters", frozenset(self.denied_parameters))
     
     def is_allowed(self, session_id: str, call_count: int) -> tuple[bool, Optional[str]]:
         """Check if tool call is allowed under this rule.
@@ -67,7 +80,8 @@ class ToolPolicyRule:
         Returns:
             Tuple of (valid, reason)
         """
-        param_keys = set(parameters.keys())
+        # dict keys views support set operations directly (no copy)
+        param_keys = parameters.keys()
         
         # Check denied parameters (takes precedence)
         if self.denied_parameters:
@@ -98,8 +112,20 @@ class ToolPolicy:
             rule.tool_name: rule for rule in self.rules
         }
         
-        # Track per-session call counts
-        self._session_call_counts: Dict[str, Dict[str, int]] = {}
+        # Tools allowed with no session, call-count or parameter constraints
+        self._fast_allow: FrozenSet[str] = frozenset(
+            name for name, rule in self._rule_map.items()
+            if rule.action == ToolAction.ALLOW
+            and rule.allowed_sessions is None
+            and rule.max_calls_per_session is None
+            and rule.allowed_parameters is None
+            and not rule.denied_parameters
+        )
+        
+        # Track per-session call counts, keyed by (session_id, tool_name)
+        self._call_counts: Dict[Tuple[str, str], int] = {}
+        # Tools with a recorded call, per session (for stats and reset)
+        self._session_tools: Dict[str, Set[str]] = {}
         
         logger.info("tool_policy_initialized", rule_count=len(self.rules))
     
@@ -164,6 +190,10 @@ class ToolPolicy:
         Returns:
             Tuple of (allowed, reason)
         """
+        # Unconstrained ALLOW rules need no further checks
+        if tool_name in self._fast_allow:
+            return True, None
+        
         # Get rule for tool
         rule = self._rule_map.get(tool_name)
         
@@ -173,8 +203,7 @@ class ToolPolicy:
             return False, f"Tool {tool_name} not in policy (denied by default)"
         
         # Get current call count for this tool in this session
-        session_counts = self._session_call_counts.setdefault(session_id, {})
-        call_count = session_counts.get(tool_name, 0)
+        call_count = self._call_counts.get((session_id, tool_name), 0)
         
         # Check rule
         allowed, reason = rule.is_allowed(session_id, call_count)
@@ -199,18 +228,27 @@ class ToolPolicy:
     
     def record_tool_call(self, tool_name: str, session_id: str):
         """Record a successful tool call (increments counter)."""
-        session_counts = self._session_call_counts.setdefault(session_id, {})
-        session_counts[tool_name] = session_counts.get(tool_name, 0) + 1
+        key = (session_id, tool_name)
+        count = self._call_counts.get(key)
+        if count is None:
+            self._session_tools.setdefault(session_id, set()).add(tool_name)
+            count = 0
+        self._call_counts[key] = count + 1
     
     def reset_session(self, session_id: str):
         """Reset call counts for a session."""
-        if session_id in self._session_call_counts:
-            del self._session_call_counts[session_id]
+        tools = self._session_tools.pop(session_id, None)
+        if tools is not None:
+            for tool_name in tools:
+                del self._call_counts[(session_id, tool_name)]
             logger.info("session_policy_reset", session_id=session_id)
     
     def get_session_stats(self, session_id: str) -> Dict[str, int]:
         """Get call counts for a session."""
-        return self._session_call_counts.get(session_id, {}).copy()
+        return {
+            tool_name: self._call_counts[(session_id, tool_name)]
+            for tool_name in self._session_tools.get(session_id, ())
+        }
     
     @classmethod
     def from_json(cls, path: Path) -> "ToolPolicy":
@@ -246,15 +284,15 @@ class ToolPolicy:
             # Parse sets from lists
             allowed_sessions = rule_data.get("allowed_sessions")
             if allowed_sessions is not None:
-                allowed_sessions = set(allowed_sessions)
+                allowed_sessions = frozenset(allowed_sessions)
             
             allowed_parameters = rule_data.get("allowed_parameters")
             if allowed_parameters is not None:
-                allowed_parameters = set(allowed_parameters)
+                allowed_parameters = frozenset(allowed_parameters)
             
             denied_parameters = rule_data.get("denied_parameters")
             if denied_parameters is not None:
-                denied_parameters = set(denied_parameters)
+                denied_parameters = frozenset(denied_parameters)
             
             rule = ToolPolicyRule(
                 tool_name=rule_data["tool_name"],
@@ -1,21 +1,24 @@
 """Rate limiter for MCP tool calls.
 
-Prevents abuse and DoS attacks by limiting:
+Token-bucket limits (burst up to the configured limit, refilled evenly
+over the window) prevent abuse and DoS attacks by limiting:
 - Tool calls per session
 - Tool calls per tool per session  
 - Global rate across all sessions
 """
 
+import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
 
 from packages.structured_logging import get_logger
 
 logger = get_logger(__name__)
 
+# Number of stripe locks (power of two, indexed by key hash)
+_LOCK_STRIPES = 64
+
 
 @dataclass
 class RateLimitConfig:
@@ -41,34 +44,70 @@ class RateLimitConfig:
 
 @dataclass
 class RateLimitState:
-    """Tracks rate limit state for a key."""
+    """Tracks rate limit state for a key.
+    
+    Each window is a token bucket holding at most ``limit`` tokens and
+    refilling continuously at ``limit / window`` tokens per second, so a
+    check is O(1) regardless of call volume. Buckets start full: the
+    limiter seeds both token counts with their limits on creation.
+    """
     
-    calls_minute: list[float] = field(default_factory=list)
-    calls_hour: list[float] = field(default_factory=list)
+    tokens_minute: float
+    tokens_hour: float
+    last_refill: float = 0.0
     consecutive_rejections: int = 0
-    circuit_breaker_until: Optional[float] = None
+    # Circuit breaker is tripped while now < circuit_breaker_until (0.0 = armed)
+    circuit_breaker_until: float = 0.0
+    
+    def refill(self, now: float, limit_minute: int, limit_hour: int) -> None:
+        """Top up both buckets for the time elapsed since the last refill."""
+        if now <= self.last_refill:
+            # A concurrent caller already refilled with a later timestamp
+            return
+        elapsed = now - self.last_refill
+        self.tokens_minute = min(limit_minute, self.tokens_minute + elapsed * limit_minute / 60)
+        self.tokens_hour = min(limit_hour, self.tokens_hour + elapsed * limit_hour / 3600)
+        self.last_refill = now
 
 
 class RateLimiter:
     """Rate limiter with per-tool, per-session, and global limits."""
     
-    def __init__(self, config: Optional[RateLimitConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RateLimitConfig] = None,
+        clock: Optional[Callable[[], float]] = None,
+    ):
         """Initialize rate limiter.
         
         Args:
             config: Rate limit configuration (uses defaults if None)
+            clock: Monotonic clock in seconds (defaults to time.monotonic);
+                tests inject a fake clock to advance time without sleeping
         """
         self.config = config or RateLimitConfig()
+        self._clock = clock or time.monotonic
         
         # State tracking: key -> RateLimitState
         # Keys: "tool:{tool_name}", "session:{session_id}", "global"
-        self._state: Dict[str, RateLimitState] = defaultdict(RateLimitState)
+        self._state: Dict[str, RateLimitState] = {}
+        
+        # Striped locks: a key's state is only touched under its stripe
+        self._stripes = [threading.Lock() for _ in range(_LOCK_STRIPES)]
         
         logger.info("rate_limiter_initialized",
                    tool_limit_minute=self.config.tool_calls_per_minute,
                    session_limit_minute=self.config.session_calls_per_minute,
                    circuit_breaker=self.config.enable_circuit_breaker)
     
+    def _limits_for(self, key: str) -> tuple[int, int]:
+        """Return (per_minute, per_hour) limits for a state key."""
+        if key.startswith("tool:"):
+            return self.config.tool_calls_per_minute, self.config.tool_calls_per_hour
+        if key.startswith("session:"):
+            return self.config.session_calls_per_minute, self.config.session_calls_per_hour
+        return self.config.global_calls_per_minute, self.config.global_calls_per_hour
+    
     def check_rate_limit(
         self,
         tool_name: str,
@@ -84,70 +123,103 @@ class RateLimiter:
             Tuple of (allowed: bool, reason: Optional[str])
             If not allowed, reason explains which limit was exceeded
         """
-        now = time.time()
+        now = self._clock()
+        keys = [f"tool:{tool_name}", f"session:{session_id}", "global"]
         
-        # Check circuit breaker
+        # Check circuit breaker: a single float compare per key, no lock.
+        # The deadline is only written under the key's stripe lock.
         if self.config.enable_circuit_breaker:
-            for key in [f"tool:{tool_name}", f"session:{session_id}", "global"]:
-                state = self._state[key]
-                if state.circuit_breaker_until and now < state.circuit_breaker_until:
+            for key in keys:
+                state = self._state.get(key)
+                if state is not None and now < state.circuit_breaker_until:
                     remaining = int(state.circuit_breaker_until - now)
                     logger.warning("rate_limit_circuit_breaker_active",
                                  key=key,
                                  remaining_seconds=remaining)
                     return False, f"Circuit breaker active for {key} ({remaining}s remaining)"
         
-        # Clean old entries and check limits
-        checks = [
-            (f"tool:{tool_name}", self.config.tool_calls_per_minute, self.config.tool_calls_per_hour),
-            (f"session:{session_id}", self.config.session_calls_per_minute, self.config.session_calls_per_hour),
-            ("global", self.config.global_calls_per_minute, self.config.global_calls_per_hour),
-        ]
-        
-        for key, limit_minute, limit_hour in checks:
-            state = self._state[key]
-            
-            # Clean old entries
-            state.calls_minute = [t for t in state.calls_minute if now - t < 60]
-            state.calls_hour = [t for t in state.calls_hour if now - t < 3600]
+        # Take a token from each scope under that scope's stripe lock, so
+        # unrelated tools/sessions never contend; refund on rejection.
+        taken: list[str] = []
+        for key in keys:
+            limit_minute, limit_hour = self._limits_for(key)
+            with self._lock_for(key):
+                state = self._state_for(key, now)
+                state.refill(now, limit_minute, limit_hour)
+                
+                if state.tokens_minute < 1:
+                    window, limit = "minute", limit_minute
+                elif state.tokens_hour < 1:
+                    window, limit = "hour", limit_hour
+                else:
+                    state.tokens_minute -= 1
+                    state.tokens_hour -= 1
+                    taken.append(key)
+                    continue
+                
+                self._handle_rejection(key, state, now)
             
-            # Check minute limit
-            if len(state.calls_minute) >= limit_minute:
-                self._handle_rejection(key, state)
-                logger.warning("rate_limit_exceeded",
-                             key=key,
-                             limit="per_minute",
-                             count=len(state.calls_minute),
-                             max=limit_minute)
-                return False, f"Rate limit exceeded for {key}: {len(state.calls_minute)}/{limit_minute} per minute"
-            
-            # Check hour limit
-            if len(state.calls_hour) >= limit_hour:
-                self._handle_rejection(key, state)
-                logger.warning("rate_limit_exceeded",
-                             key=key,
-                             limit="per_hour",
-                             count=len(state.calls_hour),
-                             max=limit_hour)
-                return False, f"Rate limit exceeded for {key}: {len(state.calls_hour)}/{limit_hour} per hour"
-        
-        # All checks passed - record call
-        for key, _, _ in checks:
-            state = self._state[key]
-            state.calls_minute.append(now)
-            state.calls_hour.append(now)
-            state.consecutive_rejections = 0  # Reset on success
+            self._refund(taken)
+            logger.warning("rate_limit_exceeded",
+                         key=key,
+                         limit=f"per_{window}",
+                         max=limit)
+            return False, f"Rate limit exceeded for {key}: limit {limit} per {window}"
+        
+        # All checks passed. A plain store is atomic; losing a racing
+        # rejection increment here only delays the circuit breaker.
+        for key in keys:
+            state = self._state.get(key)
+            if state is not None and state.consecutive_rejections:
+                state.consecutive_rejections = 0
         
         return True, None
     
-    def _handle_rejection(self, key: str, state: RateLimitState) -> None:
-        """Handle rate limit rejection and possibly activate circuit breaker."""
+    def _state_for(self, key: str, now: float) -> RateLimitState:
+        """Return the state for a key, creating it with full buckets.
+        
+        Must be called under the key's stripe lock.
+        """
+        state = self._state.get(key)
+        if state is None:
+            limit_minute, limit_hour = self._limits_for(key)
+            state = RateLimitState(
+                tokens_minute=float(limit_minute),
+                tokens_hour=float(limit_hour),
+                last_refill=now,
+            )
+            self._state[key] = state
+        return state
+    
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Return the stripe lock guarding a state key."""
+        return self._stripes[hash(key) & (_LOCK_STRIPES - 1)]
+    
+    def _refund(self, keys: list[str]) -> None:
+        """Return tokens taken for a call that was rejected by a later scope."""
+        for key in keys:
+            limit_minute, limit_hour = self._limits_for(key)
+            with self._lock_for(key):
+                state = self._state.get(key)
+                if state is None:
+                    # Reset since the token was taken; the bucket is full
+                    continue
+                state.tokens_minute = min(limit_minute, state.tokens_minute + 1)
+                state.tokens_hour = min(limit_hour, state.tokens_hour + 1)
+    
+    def _handle_rejection(self, key: str, state: RateLimitState, now: float) -> None:
+        """Handle rate limit rejection and possibly trip the circuit breaker.
+        
+        Must be called under the key's stripe lock.
+        """
         state.consecutive_rejections += 1
         
         if (self.config.enable_circuit_breaker and 
-            state.consecutive_rejections >= self.config.circuit_breaker_threshold):
+            state.consecutive_rejections >= self.config.circuit_breaker_threshold and
+            now >= state.circuit_breaker_until):
             
-            state.circuit_breaker_until = time.time() + self.config.circuit_breaker_timeout
+            # ARMED -> TRIPPED; only one caller can make this transition
+            state.circuit_breaker_until = now + self.config.circuit_breaker_timeout
             
             logger.error("rate_limit_circuit_breaker_activated",
                         key=key,
@@ -155,24 +227,24 @@ class RateLimiter:
                         timeout_seconds=self.config.circuit_breaker_timeout)
     
     def get_stats(self) -> dict:
-        """Get rate limiter statistics."""
-        now = time.time()
+        """Get rate limiter statistics.
+        
+        Call counts are the tokens currently drawn from each bucket, i.e.
+        the recent calls not yet refilled.
+        """
+        now = self._clock()
         stats = {}
         
-        for key, state in self._state.items():
-            # Clean old entries for accurate counts
-            calls_minute = [t for t in state.calls_minute if now - t < 60]
-            calls_hour = [t for t in state.calls_hour if now - t < 3600]
-            
-            stats[key] = {
-                "calls_last_minute": len(calls_minute),
-                "calls_last_hour": len(calls_hour),
-                "consecutive_rejections": state.consecutive_rejections,
-                "circuit_breaker_active": (
-                    state.circuit_breaker_until is not None and 
-                    now < state.circuit_breaker_until
-                ),
-            }
+        for key, state in list(self._state.items()):
+            limit_minute, limit_hour = self._limits_for(key)
+            with self._lock_for(key):
+                state.refill(now, limit_minute, limit_hour)
+                stats[key] = {
+                    "calls_last_minute": round(limit_minute - state.tokens_minute),
+                    "calls_last_hour": round(limit_hour - state.tokens_hour),
+                    "consecutive_rejections": state.consecutive_rejections,
+                    "circuit_breaker_active": now < state.circuit_breaker_until,
+                }
         
         return stats
     
@@ -12,39 +12,72 @@ from typing import Any, Dict, List, Pattern
 
 from packages.structured_logging import get_logger
 
+try:  # Optional: linear-time (DFA) matching via google-re2
+    import re2  # pyright: ignore[reportMissingImports]
+except ImportError:  # pragma: no cover - exercised only without the extra
+    re2 = None
+
 logger = get_logger(__name__)
 
 
+# Default patterns, compiled once at import and shared by every config
+_DEFAULT_PATTERNS: tuple[tuple[Pattern, str], ...] = (
+    # Account IDs: DU123456 -> DU****56
+    (re.compile(r'\b(DU|U)(\d{4})(\d{2})\b'), r'\1****\3'),
+    
+    # Token/API keys: "token_abc123def456" -> "token_***"
+    (re.compile(r'(token|key|secret|password|api_key)["\s:=]+([a-zA-Z0-9+/]{8,})', re.IGNORECASE), 
+     r'\1="***"'),
+    
+    # Email addresses: user@example.com -> u***@example.com
+    (re.compile(r'\b([a-zA-Z0-9])([a-zA-Z0-9._+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'),
+     r'\1***@\3'),
+    
+    # Credit card-like numbers: 1234-5678-9012-3456 -> ****-****-****-3456
+    (re.compile(r'\b(\d{4})-(\d{4})-(\d{4})-(\d{4})\b'),
+     r'****-****-****-\4'),
+    
+    # SSN-like patterns: 123-45-6789 -> ***-**-6789
+    (re.compile(r'\b(\d{3})-(\d{2})-(\d{4})\b'),
+     r'***-**-\3'),
+)
+
+
+# Inline flags, so a pattern's flags survive recompilation from its source
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+
+def _compile_pattern(pattern: Pattern) -> Pattern:
+    r"""Recompile a redaction pattern with RE2 when ``google-re2`` is installed.
+    
+    RE2 scans in O(n) with no backtracking. Patterns using features it lacks
+    (backreferences, lookaround), or any pattern without the extra installed,
+    keep the stdlib engine. RE2's ``\d`` and ``\b`` are ASCII-only, so on
+    non-ASCII text (e.g. Arabic-Indic digits) its matches differ from ``re``.
+    """
+    if re2 is None:
+        return pattern
+    
+    flags = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    source = f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+    try:
+        return re2.compile(source)
+    except re2.error:
+        logger.info("redaction_re2_unsupported_pattern")
+        return pattern
+
+
 class RedactionConfig:
     """Configuration for output redaction."""
     
     def __init__(self):
         """Initialize redaction patterns."""
         
-        # Patterns to redact
-        self.patterns: List[tuple[Pattern, str]] = [
-            # Account IDs: DU123456 -> DU****56
-            (re.compile(r'\b(DU|U)(\d{4})(\d{2})\b'), r'\1****\3'),
-            
-            # Token/API keys: "token_abc123def456" -> "token_***"
-            (re.compile(r'(token|key|secret|password|api_key)["\s:=]+([a-zA-Z0-9+/]{8,})', re.IGNORECASE), 
-             r'\1="***"'),
-            
-            # Email addresses: user@example.com -> u***@example.com
-            (re.compile(r'\b([a-zA-Z0-9])([a-zA-Z0-9._+-]+)@([a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'),
-             r'\1***@\3'),
-            
-            # Credit card-like numbers: 1234-5678-9012-3456 -> ****-****-****-3456
-            (re.compile(r'\b(\d{4})-(\d{4})-(\d{4})-(\d{4})\b'),
-             r'****-****-****-\4'),
-            
-            # SSN-like patterns: 123-45-6789 -> ***-**-6789
-            (re.compile(r'\b(\d{3})-(\d{2})-(\d{4})\b'),
-             r'***-**-\3'),
-        ]
-        
-        # Fields to always redact completely
-        self.sensitive_fields = {
+        # Patterns to redact (precompiled (pattern, replacement) pairs)
+        self.patterns: List[tuple[Pattern, str]] = list(_DEFAULT_PATTERNS)
+        
+        # Fields to always redact completely (lowercase; matched case-insensitively)
+        self.sensitive_fields: frozenset[str] = frozenset({
             "password",
             "secret",
             "api_key",
@@ -53,7 +86,7 @@ class RedactionConfig:
             "private_key",
             "ssn",
             "tax_id",
-        }
+        })
         
         # Fields to partially redact (show last N chars)
         self.partial_redact_fields = {
@@ -73,6 +106,15 @@ class OutputRedactor:
             config: Redaction configuration (uses defaults if None)
         """
         self.config = config or RedactionConfig()
+        self._patterns = tuple(
+            (_compile_pattern(pattern), replacement)
+            for pattern, replacement in self.config.patterns
+        )
+        # Normalize field names once so lookups are plain set/dict hits
+        self._sensitive_fields = frozenset(f.lower() for f in self.config.sensitive_fields)
+        self._partial_fields = {
+            f.lower(): n for f, n in self.config.partial_redact_fields.items()
+        }
         logger.info("output_redactor_initialized",
                    pattern_count=len(self.config.patterns),
                    sensitive_fields=len(self.config.sensitive_fields))
@@ -80,6 +122,9 @@ class OutputRedactor:
     def redact(self, data: Any) -> Any:
         """Redact sensitive information from data.
         
+        Nested dicts/lists are walked iteratively with an explicit stack
+        (no recursion, so no per-level call overhead or depth limit).
+        
         Args:
             data: Data to redact (str, dict, list, or primitive)
         
@@ -88,52 +133,77 @@ class OutputRedactor:
         """
         if isinstance(data, str):
             return self._redact_string(data)
-        elif isinstance(data, dict):
-            return self._redact_dict(data)
-        elif isinstance(data, list):
-            return [self.redact(item) for item in data]
-        else:
+        if not isinstance(data, (dict, list)):
             # Primitive types (int, float, bool, None)
             return data
+        
+        stack: list[tuple[Any, Any]] = []
+        root = self._redact_value(data, stack)
+        
+        while stack:
+            source, target = stack.pop()
+            if isinstance(source, dict):
+                for key, value in source.items():
+                    target[key] = self._redact_field(key, value, stack)
+            else:
+                for index, item in enumerate(source):
+                    target[index] = self._redact_value(item, stack)
+        
+        return root
+    
+    def _redact_value(self, value: Any, stack: list[tuple[Any, Any]]) -> Any:
+        """Redact a scalar, or allocate an empty copy of a container and queue it."""
+        if isinstance(value, str):
+            return self._redact_string(value)
+        if isinstance(value, dict):
+            target: Any = {}
+        elif isinstance(value, list):
+            target = [None] * len(value)
+        else:
+            return value
+        stack.append((value, target))
+        return target
     
     def _redact_string(self, text: str) -> str:
-        """Apply regex patterns to redact string."""
+        """Apply regex patterns to redact string.
+        
+        Patterns run one after another over the output of the previous one,
+        so text inside one pattern's match is still checked by the others.
+        """
         result = text
         
-        for pattern, replacement in self.config.patterns:
+        for pattern, replacement in self._patterns:
             result = pattern.sub(replacement, result)
         
         return result
     
-    def _redact_dict(self, data: dict) -> dict:
-        """Redact dictionary recursively."""
-        result = {}
-        
-        for key, value in data.items():
-            key_lower = key.lower()
-            
-            # Complete redaction for sensitive fields
-            if key_lower in self.config.sensitive_fields:
-                result[key] = "***REDACTED***"
-                logger.debug("field_redacted", field=key)
-                continue
-            
-            # Partial redaction for certain fields
-            if key_lower in self.config.partial_redact_fields and isinstance(value, str):
-                show_chars = self.config.partial_redact_fields[key_lower]
-                if len(value) > show_chars:
-                    result[key] = "*" * (len(value) - show_chars) + value[-show_chars:]
-                else:
-                    result[key] = value
-                continue
-            
-            # Recursive redaction
-            if isinstance(value, (dict, list, str)):
-                result[key] = self.redact(value)
-            else:
-                result[key] = value
+    def _redact_field(self, key: str, value: Any, stack: list[tuple[Any, Any]]) -> Any:
+        """Redact a dictionary value, applying field-name rules first.
         
-        return result
+        Field names are matched exactly first (the common, lowercase case);
+        ``key.lower()`` is only tried when the exact lookups miss.
+        """
+        sensitive = self._sensitive_fields
+        partial = self._partial_fields
+        name = key
+        if name not in sensitive and name not in partial:
+            name = key.lower()
+            if name == key:
+                return self._redact_value(value, stack)
+        
+        # Complete redaction for sensitive fields
+        if name in sensitive:
+            logger.debug("field_redacted", field=key)
+            return "***REDACTED***"
+        
+        # Partial redaction for certain fields
+        if name in partial and isinstance(value, str):
+            show_chars = partial[name]
+            if len(value) > show_chars:
+                return "*" * (len(value) - show_chars) + value[-show_chars:]
+            return value
+        
+        return self._redact_value(value, stack)
     
     def redact_json_string(self, json_str: str) -> str:
         """Redact JSON string directly (without parsing).
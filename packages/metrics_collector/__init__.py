@@ -20,14 +20,47 @@ Usage:
 """
 
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from threading import Lock
 from typing import Optional
 
-__all__ = ["MetricsCollector", "get_metrics_collector", "set_metrics_collector"]
+__all__ = ["MAX_LATENCY_SAMPLES", "MetricsCollector", "get_metrics_collector", "set_metrics_collector"]
+
+# Latency samples kept per histogram (oldest dropped first)
+MAX_LATENCY_SAMPLES = 10_000
+
+# Number of stripe locks for keyed counters (power of two, indexed by key hash)
+_COUNTER_STRIPES = 16
+
+
+# Prometheus label value escaping (backslash, double quote, newline)
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+# Reported summary quantiles
+_QUANTILES = (("0.5", 0.50), ("0.95", 0.95), ("0.99", 0.99))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value in one translate() pass."""
+    return value.translate(_LABEL_ESCAPES)
+
+
+def _append_latency_summary(
+    lines: list[str], metric: str, help_text: str, sorted_latencies: list[float]
+) -> None:
+    """Append a Prometheus summary block for non-empty sorted latencies."""
+    count = len(sorted_latencies)
+    lines.append(f"# HELP {metric} {help_text}")
+    lines.append(f"# TYPE {metric} summary")
+    lines.append(f"{metric}_count {count}")
+    lines.append(f"{metric}_sum {sum(sorted_latencies):.4f}")
+    quantile_prefix = f'{metric}{{quantile="'
+    for label, q in _QUANTILES:
+        lines.append(f'{quantile_prefix}{label}"}} {sorted_latencies[int(count * q)]:.4f}')
+    lines.append("")
 
 
 @dataclass
@@ -42,16 +75,28 @@ class MetricsCollector:
     # Gauges (current value)
     daily_pnl: Decimal = field(default_factory=lambda: Decimal("0"))
     
-    # Histograms (latencies in seconds)
-    submission_latencies: list[float] = field(default_factory=list)
-    fill_latencies: list[float] = field(default_factory=list)
+    # Histograms (latencies in seconds), bounded to the most recent samples
+    submission_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=MAX_LATENCY_SAMPLES))
+    fill_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=MAX_LATENCY_SAMPLES))
+    
+    # Sorted latency snapshots by operation, dropped when a sample is recorded
+    _sorted_latencies_cache: dict[str, list[float]] = field(default_factory=dict, repr=False)
     
     # Lock for thread safety
     _lock: Lock = field(default_factory=Lock)
     
+    # Striped locks for keyed counters: increments of unrelated keys don't contend
+    _stripes: list[Lock] = field(
+        default_factory=lambda: [Lock() for _ in range(_COUNTER_STRIPES)], repr=False
+    )
+    
     # Start time for uptime
     _start_time: float = field(default_factory=time.time)
     
+    def _stripe_for(self, key: object) -> Lock:
+        """Return the stripe lock guarding a keyed counter entry."""
+        return self._stripes[hash(key) & (_COUNTER_STRIPES - 1)]
+    
     def increment_proposal_count(self, symbol: str, state: str) -> None:
         """Increment proposal count for symbol and state.
         
@@ -59,8 +104,8 @@ class MetricsCollector:
             symbol: Stock symbol (e.g., AAPL, TSLA)
             state: Proposal state (e.g., RISK_APPROVED, APPROVAL_GRANTED)
         """
-        with self._lock:
-            key = (symbol, state)
+        key = (symbol, state)
+        with self._stripe_for(key):
             self.proposal_count[key] += 1
     
     def record_risk_rejection(self, rule: str) -> None:
@@ -69,7 +114,7 @@ class MetricsCollector:
         Args:
             rule: Risk rule ID (e.g., R1, R2)
         """
-        with self._lock:
+        with self._stripe_for(rule):
             self.risk_rejection_count[rule] += 1
     
     def increment_broker_errors(self) -> None:
@@ -98,6 +143,21 @@ class MetricsCollector:
                 self.submission_latencies.append(latency_seconds)
             elif operation == "fill":
                 self.fill_latencies.append(latency_seconds)
+            else:
+                return
+            self._sorted_latencies_cache.pop(operation, None)
+    
+    def _sorted_latencies(self, operation: str) -> list[float]:
+        """Return sorted latencies for an operation, reusing the last sort.
+        
+        Must be called with the lock held. Repeated scrapes without new
+        samples don't re-sort.
+        """
+        cached = self._sorted_latencies_cache.get(operation)
+        if cached is None:
+            samples = self.submission_latencies if operation == "submission" else self.fill_latencies
+            cached = self._sorted_latencies_cache[operation] = sorted(samples)
+        return cached
     
     def reset_daily_metrics(self) -> None:
         """Reset daily metrics (call at midnight)."""
@@ -111,89 +171,84 @@ class MetricsCollector:
     def export_prometheus(self) -> str:
         """Export metrics in Prometheus text format.
         
+        State is snapshotted under the lock and formatted after releasing
+        it, so string building never blocks concurrent recorders.
+        
         Returns:
             Prometheus-formatted metrics string
         """
         with self._lock:
-            lines = []
-            
-            # Metadata
-            lines.append("# HELP ibkr_broker_info Broker information")
-            lines.append("# TYPE ibkr_broker_info gauge")
-            lines.append('ibkr_broker_info{version="1.0.0"} 1')
-            lines.append("")
-            
-            # Uptime
-            lines.append("# HELP ibkr_uptime_seconds Uptime in seconds")
-            lines.append("# TYPE ibkr_uptime_seconds gauge")
-            lines.append(f"ibkr_uptime_seconds {self.get_uptime_seconds():.2f}")
-            lines.append("")
-            
-            # Proposal count by symbol and state
-            lines.append("# HELP ibkr_proposal_total Total number of proposals by symbol and state")
-            lines.append("# TYPE ibkr_proposal_total counter")
-            for (symbol, state), count in sorted(self.proposal_count.items()):
-                lines.append(f'ibkr_proposal_total{{symbol="{symbol}",state="{state}"}} {count}')
-            lines.append("")
-            
-            # Risk rejection count by rule
-            lines.append("# HELP ibkr_risk_rejection_total Total risk rejections by rule")
-            lines.append("# TYPE ibkr_risk_rejection_total counter")
-            for rule, count in sorted(self.risk_rejection_count.items()):
-                lines.append(f'ibkr_risk_rejection_total{{rule="{rule}"}} {count}')
-            lines.append("")
-            
-            # Broker errors
-            lines.append("# HELP ibkr_broker_error_total Total broker errors")
-            lines.append("# TYPE ibkr_broker_error_total counter")
-            lines.append(f"ibkr_broker_error_total {self.broker_error_count}")
-            lines.append("")
-            
-            # Daily P&L
-            lines.append("# HELP ibkr_daily_pnl_usd Current daily P&L in USD")
-            lines.append("# TYPE ibkr_daily_pnl_usd gauge")
-            lines.append(f"ibkr_daily_pnl_usd {float(self.daily_pnl):.2f}")
-            lines.append("")
-            
-            # Submission latency stats
-            if self.submission_latencies:
-                lines.append("# HELP ibkr_submission_latency_seconds Order submission latency")
-                lines.append("# TYPE ibkr_submission_latency_seconds summary")
-                sorted_latencies = sorted(self.submission_latencies)
-                count = len(sorted_latencies)
-                total = sum(sorted_latencies)
-                lines.append(f"ibkr_submission_latency_seconds_count {count}")
-                lines.append(f"ibkr_submission_latency_seconds_sum {total:.4f}")
-                # Quantiles
-                if count > 0:
-                    p50_idx = int(count * 0.50)
-                    p95_idx = int(count * 0.95)
-                    p99_idx = int(count * 0.99)
-                    lines.append(f'ibkr_submission_latency_seconds{{quantile="0.5"}} {sorted_latencies[p50_idx]:.4f}')
-                    lines.append(f'ibkr_submission_latency_seconds{{quantile="0.95"}} {sorted_latencies[p95_idx]:.4f}')
-                    lines.append(f'ibkr_submission_latency_seconds{{quantile="0.99"}} {sorted_latencies[p99_idx]:.4f}')
-                lines.append("")
-            
-            # Fill latency stats
-            if self.fill_latencies:
-                lines.append("# HELP ibkr_fill_latency_seconds Order fill latency")
-                lines.append("# TYPE ibkr_fill_latency_seconds summary")
-                sorted_latencies = sorted(self.fill_latencies)
-                count = len(sorted_latencies)
-                total = sum(sorted_latencies)
-                lines.append(f"ibkr_fill_latency_seconds_count {count}")
-                lines.append(f"ibkr_fill_latency_seconds_sum {total:.4f}")
-                # Quantiles
-                if count > 0:
-                    p50_idx = int(count * 0.50)
-                    p95_idx = int(count * 0.95)
-                    p99_idx = int(count * 0.99)
-                    lines.append(f'ibkr_fill_latency_seconds{{quantile="0.5"}} {sorted_latencies[p50_idx]:.4f}')
-                    lines.append(f'ibkr_fill_latency_seconds{{quantile="0.95"}} {sorted_latencies[p95_idx]:.4f}')
-                    lines.append(f'ibkr_fill_latency_seconds{{quantile="0.99"}} {sorted_latencies[p99_idx]:.4f}')
-                lines.append("")
-            
-            return "\n".join(lines)
+            # dict() copies atomically; keyed counters are updated under stripe locks
+            proposal_count = dict(self.proposal_count)
+            risk_rejection_count = dict(self.risk_rejection_count)
+            broker_error_count = self.broker_error_count
+            daily_pnl = self.daily_pnl
+            # Cached sorted lists are replaced, never mutated, so they are safe to share
+            submission_latencies = (
+                self._sorted_latencies("submission") if self.submission_latencies else None
+            )
+            fill_latencies = self._sorted_latencies("fill") if self.fill_latencies else None
+        
+        lines = []
+        
+        # Metadata
+        lines.append("# HELP ibkr_broker_info Broker information")
+        lines.append("# TYPE ibkr_broker_info gauge")
+        lines.append('ibkr_broker_info{version="1.0.0"} 1')
+        lines.append("")
+        
+        # Uptime
+        lines.append("# HELP ibkr_uptime_seconds Uptime in seconds")
+        lines.append("# TYPE ibkr_uptime_seconds gauge")
+        lines.append(f"ibkr_uptime_seconds {self.get_uptime_seconds():.2f}")
+        lines.append("")
+        
+        # Proposal count by symbol and state
+        lines.append("# HELP ibkr_proposal_total Total number of proposals by symbol and state")
+        lines.append("# TYPE ibkr_proposal_total counter")
+        for (symbol, state), count in sorted(proposal_count.items()):
+            lines.append(
+                f'ibkr_proposal_total{{symbol="{_escape_label(symbol)}",'
+                f'state="{_escape_label(state)}"}} {count}'
+            )
+        lines.append("")
+        
+        # Risk rejection count by rule
+        lines.append("# HELP ibkr_risk_rejection_total Total risk rejections by rule")
+        lines.append("# TYPE ibkr_risk_rejection_total counter")
+        for rule, count in sorted(risk_rejection_count.items()):
+            lines.append(f'ibkr_risk_rejection_total{{rule="{_escape_label(rule)}"}} {count}')
+        lines.append("")
+        
+        # Broker errors
+        lines.append("# HELP ibkr_broker_error_total Total broker errors")
+        lines.append("# TYPE ibkr_broker_error_total counter")
+        lines.append(f"ibkr_broker_error_total {broker_error_count}")
+        lines.append("")
+        
+        # Daily P&L
+        lines.append("# HELP ibkr_daily_pnl_usd Current daily P&L in USD")
+        lines.append("# TYPE ibkr_daily_pnl_usd gauge")
+        lines.append(f"ibkr_daily_pnl_usd {float(daily_pnl):.2f}")
+        lines.append("")
+        
+        # Latency summaries
+        if submission_latencies:
+            _append_latency_summary(
+                lines,
+                "ibkr_submission_latency_seconds",
+                "Order submission latency",
+                submission_latencies,
+            )
+        if fill_latencies:
+            _append_latency_summary(
+                lines,
+                "ibkr_fill_latency_seconds",
+                "Order fill latency",
+                fill_latencies,
+            )
+        
+        return "\n".join(lines)
 
 
 # Global metrics collector instance
@@ -7,14 +7,12 @@ state transitions, and audit trail.
 
 from datetime import datetime, timezone
 from typing import Optional
-import json
 
 from packages.approval_service import ApprovalService
 from packages.audit_store import AuditStore, AuditEventCreate, EventType
 from packages.broker_ibkr.adapter import BrokerAdapter
 from packages.broker_ibkr.models import OpenOrder, OrderStatus
 from packages.schemas.approval import OrderState
-from packages.schemas.order_intent import OrderIntent
 
 
 class OrderSubmissionError(Exception):
@@ -123,8 +121,7 @@ class OrderSubmitter:
         
         # Parse OrderIntent from JSON
         try:
-            intent_dict = json.loads(proposal.intent_json)
-            order_intent = OrderIntent(**intent_dict)
+            order_intent = proposal.intent
         except Exception as e:
             self._emit_event(
                 "OrderSubmissionFailed",
@@ -7,7 +7,8 @@ Defines the order lifecycle state machine, approval tokens, and approval request
 from datetime import datetime, timezone
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from functools import cached_property
+from typing import Any, Mapping, Optional, Self
 
 from pydantic import BaseModel, Field, field_validator, computed_field
 import hashlib
@@ -68,12 +69,24 @@ class OrderProposal(BaseModel):
         """Compute SHA256 hash of intent JSON for anti-tamper verification."""
         return hashlib.sha256(self.intent_json.encode('utf-8')).hexdigest()
     
-    @property
+    @cached_property
     def intent(self):
-        """Parse and return OrderIntent from JSON."""
+        """
+        Parse and return OrderIntent from JSON.
+        
+        Parsed once per proposal and stored in the instance __dict__.
+        model_copy() drops the cached value so an ``update`` of intent_json
+        is parsed afresh.
+        """
         from packages.schemas.order_intent import OrderIntent
         return OrderIntent.model_validate_json(self.intent_json)
     
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the proposal without the cached intent."""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__dict__.pop("intent", None)
+        return copied
+    
     @property
     def simulation(self):
         """Parse and return SimulationResult from JSON."""
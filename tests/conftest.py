@@ -0,0 +1,75 @@
+"""Shared pytest fixtures."""
+
+from decimal import Decimal
+
+import pytest
+
+from packages.approval_service import ApprovalService
+from packages.audit_store.middleware import correlation_id_ctx
+from packages.broker_ibkr.fake import FakeBrokerAdapter
+from packages.risk_engine import RiskEngine, RiskLimits, TradingHours
+from packages.trade_sim import SimulationConfig, TradeSimulator
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The Assistant API FastAPI application, shared by every test module.
+    
+    Imported here rather than at collection so unit tests of packages/ do not
+    load the app and its lifespan dependencies.
+    """
+    from apps.assistant_api.main import app as assistant_app
+    
+    return assistant_app
+
+
+@pytest.fixture(autouse=True)
+def _reset_correlation_id():
+    """Start every test with no correlation ID and restore the contextvar afterwards."""
+    token = correlation_id_ctx.set("")
+    yield
+    correlation_id_ctx.reset(token)
+
+
+@pytest.fixture(scope="session")
+def errs():
+    """Helper returning a raised ValidationError's errors without URL, context or input."""
+    def _errs(exc_info: pytest.ExceptionInfo) -> list[dict]:
+        return exc_info.value.errors(include_url=False, include_context=False, include_input=False)
+    
+    return _errs
+
+
+@pytest.fixture(scope="session")
+def session_services():
+    """Real broker/simulator/risk/approval services (plus pristine broker state), built once."""
+    broker = FakeBrokerAdapter(account_id="DU123456")
+    broker.connect()
+    broker_state = broker.snapshot()
+    
+    simulator = TradeSimulator(config=SimulationConfig())
+    
+    risk_engine = RiskEngine(
+        limits=RiskLimits(
+            max_position_pct=Decimal("15.0"),  # Allow up to 15% per position
+        ),
+        trading_hours=TradingHours(allow_pre_market=True, allow_after_hours=True),
+        daily_trades_count=0,
+        daily_pnl=Decimal("0"),
+    )
+    
+    approval_service = ApprovalService(max_proposals=1000)
+    
+    return broker, simulator, risk_engine, approval_service, broker_state
+
+
+@pytest.fixture
+def services(session_services):
+    """Session services with broker and approval state reset for each test."""
+    broker, simulator, risk_engine, approval_service, broker_state = session_services
+    
+    broker.restore(broker_state)
+    approval_service._proposals.clear()
+    approval_service._tokens.clear()
+    
+    return broker, simulator, risk_engine, approval_service
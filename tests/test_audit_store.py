@@ -2,12 +2,17 @@
 Unit tests for audit store models and storage.
 """
 
+import math
+import sqlite3
 import tempfile
+import threading
 from datetime import datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
 from uuid import uuid4
 
 import pytest
+from freezegun import freeze_time
 
 from packages.audit_store import (
     AuditEvent,
@@ -102,7 +107,7 @@ class TestAuditStore:
 
     def test_append_event(self, audit_store: AuditStore) -> None:
         """Test appending an event to the store."""
-        event_create = AuditEventCreate(
+        event_create = AuditEventCreate.model_construct(
             event_type=EventType.ORDER_PROPOSED,
             correlation_id="test-correlation-1",
             data={"symbol": "TSLA", "side": "BUY", "quantity": 50},
@@ -117,10 +122,33 @@ class TestAuditStore:
         assert event.data["symbol"] == "TSLA"
         assert event.metadata["user"] == "trader_1"
 
+    def test_append_events_batch(self, audit_store: AuditStore) -> None:
+        """Test appending several events in one call."""
+        events = audit_store.append_events(
+            [
+                AuditEventCreate.model_construct(
+                    event_type=EventType.ORDER_CANCEL_APPROVED,
+                    correlation_id="batch-1",
+                ),
+                AuditEventCreate.model_construct(
+                    event_type=EventType.ORDER_CANCEL_EXECUTED,
+                    correlation_id="batch-1",
+                ),
+            ]
+        )
+
+        assert [e.event_type for e in events] == [
+            EventType.ORDER_CANCEL_APPROVED,
+            EventType.ORDER_CANCEL_EXECUTED,
+        ]
+        assert all(audit_store.get_event(str(e.id)) is not None for e in events)
+        assert audit_store.get_stats().total_events == 2
+        assert audit_store.append_events([]) == []
+
     def test_get_event(self, audit_store: AuditStore) -> None:
         """Test retrieving an event by ID."""
         # Create and append event
-        event_create = AuditEventCreate(
+        event_create = AuditEventCreate.model_construct(
             event_type=EventType.RISK_GATE_EVALUATED,
             correlation_id="test-corr-2",
             data={"decision": "APPROVE"},
@@ -145,19 +173,19 @@ class TestAuditStore:
         """Test querying events by type."""
         # Append multiple events
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_PROPOSED,
                 correlation_id="corr-1",
             )
         )
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_SIMULATED,
                 correlation_id="corr-1",
             )
         )
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_PROPOSED,
                 correlation_id="corr-2",
             )
@@ -181,7 +209,7 @@ class TestAuditStore:
             EventType.RISK_GATE_EVALUATED,
         ]:
             audit_store.append_event(
-                AuditEventCreate(
+                AuditEventCreate.model_construct(
                     event_type=event_type,
                     correlation_id=correlation_id,
                 )
@@ -194,6 +222,40 @@ class TestAuditStore:
         assert len(results) == 3
         assert all(e.correlation_id == correlation_id for e in results)
 
+    def test_last_event(self, audit_store: AuditStore) -> None:
+        """Test last_event returns the most recently appended event."""
+        assert audit_store.last_event is None
+
+        for event_type in [EventType.ORDER_PROPOSED, EventType.ORDER_SUBMITTED]:
+            event = audit_store.append_event(
+                AuditEventCreate.model_construct(
+                    event_type=event_type, correlation_id="last-1"
+                )
+            )
+
+        assert audit_store.last_event is not None
+        assert audit_store.last_event.id == event.id
+        assert audit_store.last_event.event_type == EventType.ORDER_SUBMITTED
+
+    def test_events_for_correlation_id(self, audit_store: AuditStore) -> None:
+        """Test looking up events by correlation ID in insertion order."""
+        event_types = [EventType.ORDER_PROPOSED, EventType.ORDER_SIMULATED]
+        # Same timestamp for every event: ties must keep insertion order
+        with freeze_time("2024-01-01 12:00:00"):
+            for event_type in event_types:
+                audit_store.append_event(
+                    AuditEventCreate.model_construct(event_type=event_type, correlation_id="corr-a")
+                )
+            audit_store.append_event(
+                AuditEventCreate.model_construct(event_type=EventType.ORDER_PROPOSED, correlation_id="corr-b")
+            )
+
+        results = audit_store.events_for("corr-a")
+
+        assert [e.event_type for e in results] == event_types
+        assert all(e.correlation_id == "corr-a" for e in results)
+        assert audit_store.events_for("missing") == []
+
     def test_query_events_with_time_range(self, audit_store: AuditStore) -> None:
         """Test querying events within a time range."""
         now = datetime.utcnow()
@@ -202,7 +264,7 @@ class TestAuditStore:
 
         # Append event
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.KILL_SWITCH_ACTIVATED,
                 correlation_id="time-test",
             )
@@ -219,7 +281,7 @@ class TestAuditStore:
         # Append 5 events
         for i in range(5):
             audit_store.append_event(
-                AuditEventCreate(
+                AuditEventCreate.model_construct(
                     event_type=EventType.MCP_TOOL_CALLED,
                     correlation_id=f"page-test-{i}",
                 )
@@ -242,19 +304,19 @@ class TestAuditStore:
         """Test getting audit statistics."""
         # Append events of different types
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_PROPOSED,
                 correlation_id="stats-1",
             )
         )
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_PROPOSED,
                 correlation_id="stats-1",
             )
         )
         audit_store.append_event(
-            AuditEventCreate(
+            AuditEventCreate.model_construct(
                 event_type=EventType.ORDER_FILLED,
                 correlation_id="stats-2",
             )
@@ -279,13 +341,45 @@ class TestAuditStore:
         assert stats.latest_event is None
         assert stats.correlation_id_count == 0
 
+    def test_in_memory_store_persists_across_connections(self) -> None:
+        """Test ":memory:" stores keep events between per-call connections."""
+        store = AuditStore(db_path=":memory:")
+        other = AuditStore(db_path=":memory:")
+
+        event = store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.ORDER_PROPOSED,
+                correlation_id="mem-1",
+            )
+        )
+
+        assert store.get_event(str(event.id)) is not None
+        assert store.get_stats().total_events == 1
+        # Each in-memory store is private
+        assert other.get_stats().total_events == 0
+
+    def test_reset_in_memory_store(self, audit_store: AuditStore) -> None:
+        """Test only in-memory stores can be reset."""
+        store = AuditStore(db_path=":memory:")
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.ORDER_PROPOSED, correlation_id="reset-1"
+            )
+        )
+
+        store.reset()
+        assert store.get_stats().total_events == 0
+
+        with pytest.raises(RuntimeError, match="in-memory"):
+            audit_store.reset()
+
     def test_append_event_thread_safety(self, audit_store: AuditStore) -> None:
         """Test that multiple events can be appended safely."""
         # This is a basic test; true thread safety would require concurrent testing
         events = []
         for i in range(10):
             event = audit_store.append_event(
-                AuditEventCreate(
+                AuditEventCreate.model_construct(
                     event_type=EventType.MCP_TOOL_COMPLETED,
                     correlation_id=f"thread-test-{i}",
                 )
@@ -295,3 +389,184 @@ class TestAuditStore:
         # Verify all events were stored
         assert len(events) == 10
         assert len(set(e.id for e in events)) == 10  # All unique IDs
+
+    def test_buffered_appends_flush_on_threshold_and_read(self) -> None:
+        """Test buffered stores batch writes and flush before reads."""
+        store = AuditStore(db_path=":memory:", flush_threshold=3)
+
+        def raw_count() -> int:
+            with store._get_connection() as conn:
+                return conn.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0]
+
+        for i in range(2):
+            store.append_event(
+                AuditEventCreate.model_construct(
+                    event_type=EventType.MCP_TOOL_CALLED, correlation_id=f"buf-{i}"
+                )
+            )
+        assert raw_count() == 0
+
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.MCP_TOOL_CALLED, correlation_id="buf-2"
+            )
+        )
+        assert raw_count() == 3
+
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.MCP_TOOL_CALLED, correlation_id="buf-3"
+            )
+        )
+        # Reads see buffered events
+        assert store.last_event.correlation_id == "buf-3"
+        assert raw_count() == 4
+
+        with pytest.raises(ValueError, match="flush_threshold"):
+            AuditStore(db_path=":memory:", flush_threshold=0)
+
+    def test_append_events_writes_after_buffered_events(self) -> None:
+        """Test append_events keeps earlier buffered events first."""
+        store = AuditStore(db_path=":memory:", flush_threshold=10)
+
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.MCP_TOOL_CALLED, correlation_id="order-1"
+            )
+        )
+        store.append_events(
+            [
+                AuditEventCreate.model_construct(
+                    event_type=EventType.MCP_TOOL_CALLED, correlation_id="order-2"
+                )
+            ]
+        )
+
+        assert store.last_event.correlation_id == "order-2"
+        assert not store._buffer
+
+    def test_close_flushes_buffered_events(self, temp_db: Path) -> None:
+        """Test close() and leaving a with-block write the buffered tail."""
+        store = AuditStore(db_path=temp_db, flush_threshold=10)
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.MCP_TOOL_CALLED, correlation_id="close-1"
+            )
+        )
+        store.close()
+        assert not store._buffer
+
+        with AuditStore(db_path=temp_db, flush_threshold=10) as store:
+            store.append_event(
+                AuditEventCreate.model_construct(
+                    event_type=EventType.MCP_TOOL_CALLED, correlation_id="close-2"
+                )
+            )
+
+        reopened = AuditStore(db_path=temp_db)
+        assert reopened.get_stats().total_events == 2
+        assert reopened.last_event.correlation_id == "close-2"
+
+    def test_close_releases_in_memory_database(self) -> None:
+        """Test close() closes a ":memory:" store's connection."""
+        store = AuditStore(db_path=":memory:")
+        conn = store._memory_conn
+        store.close()
+
+        assert store._memory_conn is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        with pytest.raises(RuntimeError, match="closed"):
+            store.get_stats()
+
+    def test_in_memory_store_concurrent_appends(self) -> None:
+        """Test threads appending to one ":memory:" store all succeed."""
+        store = AuditStore(db_path=":memory:")
+        errors: list[Exception] = []
+
+        def append_many(worker: int) -> None:
+            try:
+                for i in range(50):
+                    store.append_event(
+                        AuditEventCreate.model_construct(
+                            event_type=EventType.MCP_TOOL_CALLED,
+                            correlation_id=f"worker-{worker}-{i}",
+                        )
+                    )
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=append_many, args=(w,)) for w in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert store.get_stats().total_events == 400
+
+    def test_failed_flush_drops_buffered_events(self) -> None:
+        """Test a failed flush raises and empties the buffer instead of growing it."""
+        store = AuditStore(db_path=":memory:", flush_threshold=2)
+        with store._get_connection() as conn:
+            conn.execute("DROP TABLE audit_events")
+
+        store.append_event(
+            AuditEventCreate.model_construct(
+                event_type=EventType.MCP_TOOL_CALLED, correlation_id="lost-1"
+            )
+        )
+        with pytest.raises(RuntimeError, match="Failed to append audit events"):
+            store.append_event(
+                AuditEventCreate.model_construct(
+                    event_type=EventType.MCP_TOOL_CALLED, correlation_id="lost-2"
+                )
+            )
+        assert not store._buffer
+
+    @pytest.mark.parametrize(
+        "value", [object(), Decimal("1.5"), datetime(2024, 1, 1), uuid4()]
+    )
+    def test_rejects_non_json_payloads(self, value: object) -> None:
+        """Test payloads json.dumps rejects fail with RuntimeError on both paths."""
+        store = AuditStore(db_path=":memory:")
+        event_create = AuditEventCreate(
+            event_type=EventType.ORDER_SUBMITTED,
+            correlation_id="ser-1",
+            data={"payload": value},
+        )
+
+        with pytest.raises(RuntimeError, match="Failed to append audit event"):
+            store.append_event(event_create)
+        with pytest.raises(RuntimeError, match="Failed to append audit event"):
+            store.append_events([event_create])
+
+        assert store.last_event is None
+
+    def test_payload_round_trips_like_json(self) -> None:
+        """Test NaN, infinities and integers wider than 64 bits round-trip."""
+        store = AuditStore(db_path=":memory:")
+
+        event = store.append_event(
+            AuditEventCreate(
+                event_type=EventType.ORDER_SUBMITTED,
+                correlation_id="ser-2",
+                data={"ratio": math.nan, "cap": -math.inf, "big": 2**70},
+            )
+        )
+        data = store.get_event(str(event.id)).data
+
+        assert math.isnan(data["ratio"])
+        assert data["cap"] == -math.inf
+        assert data["big"] == 2**70
+
+    def test_wal_is_opt_in(self, audit_store: AuditStore, tmp_path: Path) -> None:
+        """Test file-backed stores only use WAL journaling when asked to."""
+        with audit_store._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+
+        wal_store = AuditStore(db_path=tmp_path / "wal.db", wal=True)
+        with wal_store._get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
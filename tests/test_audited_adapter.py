@@ -215,8 +215,6 @@ class TestAuditedBrokerAdapter:
         audit_store: AuditStore,
     ) -> None:
         """Test audit works even without correlation ID set."""
-        set_correlation_id("")  # Clear correlation ID
-
         audited_adapter.connect()
 
         # Should use fallback correlation ID
@@ -287,6 +287,30 @@ class TestFakeBrokerAdapter:
         adapter.clear_mock_orders()
         assert len(adapter.get_open_orders("DU123456")) == 0
 
+    def test_snapshot_restore(self, adapter: FakeBrokerAdapter) -> None:
+        """Test restore() rolls back account state captured by snapshot()."""
+        snapshot = adapter.snapshot()
+
+        adapter.add_mock_order(
+            OpenOrder(
+                order_id="ord-999",
+                account_id="DU123456",
+                instrument=Instrument(type=InstrumentType.STK, symbol="AAPL"),
+                side=OrderSide.BUY,
+                quantity=Decimal("1"),
+                order_type=OrderType.MKT,
+                time_in_force=TimeInForce.DAY,
+                status=OrderStatus.PENDING,
+            )
+        )
+        adapter._cash = []
+        assert len(adapter.get_open_orders("DU123456")) == 1
+
+        adapter.restore(snapshot)
+
+        assert len(adapter.get_open_orders("DU123456")) == 0
+        assert len(adapter.get_portfolio("DU123456").cash) == 1
+
     def test_portfolio_value_calculation(
         self, adapter: FakeBrokerAdapter
     ) -> None:
@@ -11,6 +11,8 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from packages.audit_store import AuditStore
+from packages.audit_store.models import EventType
 from packages.flex_query.scheduler import FlexQueryScheduler
 from packages.flex_query.service import FlexQueryService
 from packages.schemas.flex_query import (
@@ -80,7 +82,6 @@ def mock_service():
 @pytest.fixture
 def mock_audit_store():
     """Mock AuditStore for testing."""
-    from packages.audit_store import AuditStore
     store = Mock(spec=AuditStore)
     store.append_event = Mock()
     return store
@@ -326,7 +327,6 @@ async def test_scheduler_audit_events_emitted(scheduler, mock_service, mock_audi
     
     # Check event types
     event_types = [call.args[0].event_type for call in mock_audit_store.append_event.call_args_list]
-    from packages.audit_store.models import EventType
     
     assert EventType.FLEX_QUERY_SCHEDULED in event_types
     # Should have either COMPLETED or FAILED
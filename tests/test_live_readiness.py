@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from packages.audit_store import AuditStore
+from packages.audit_store import AuditEvent, AuditQuery, AuditStore, EventType
 from packages.broker_ibkr import FakeBrokerAdapter
 from packages.health_monitor import (
     AlertCondition,
@@ -106,7 +106,6 @@ class TestLiveReadiness:
 
     def test_audit_store_writable(self, tmp_path):
         """Audit store must be writable."""
-        from packages.audit_store import AuditEvent, EventType
         from datetime import datetime, timezone
 
         audit_store = AuditStore(str(tmp_path / "audit.db"))
@@ -121,7 +120,6 @@ class TestLiveReadiness:
         audit_store.append_event(event)
 
         # Should be able to read back
-        from packages.audit_store import AuditQuery
         query = AuditQuery(correlation_id="test")
         events = audit_store.query_events(query)
         assert len(events) >= 1
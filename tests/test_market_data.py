@@ -1,8 +1,10 @@
 """Tests for market data module."""
 
+import re
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from types import SimpleNamespace
 from packages.schemas.market_data import (
     MarketSnapshot,
     MarketBar,
@@ -15,6 +17,65 @@ from packages.market_data import (
 )
 
 
+# Decimal constant pool; parsed once at import instead of in every test
+_D_NEG_10 = Decimal("-10")
+_D_10 = Decimal("10")
+_D_10_5 = Decimal("10.5")
+_D_11 = Decimal("11")
+_D_90 = Decimal("90")
+_D_95 = Decimal("95")
+_D_98 = Decimal("98")
+_D_99_00 = Decimal("99.00")
+_D_100 = Decimal("100")
+_D_100_00 = Decimal("100.00")
+_D_100_05 = Decimal("100.05")
+_D_100_10 = Decimal("100.10")
+_D_100_50 = Decimal("100.50")
+_D_101_00 = Decimal("101.00")
+_D_105 = Decimal("105")
+_D_108 = Decimal("108")
+_D_110 = Decimal("110")
+_D_174_00 = Decimal("174.00")
+_D_174_80 = Decimal("174.80")
+_D_175_00 = Decimal("175.00")
+_D_175_50 = Decimal("175.50")
+_D_175_52 = Decimal("175.52")
+_D_175_525 = Decimal("175.525")
+_D_175_55 = Decimal("175.55")
+_D_176_00 = Decimal("176.00")
+_D_176_20 = Decimal("176.20")
+_D_176_50 = Decimal("176.50")
+_D_460_00 = Decimal("460.00")
+_D_460_05 = Decimal("460.05")
+_D_460_10 = Decimal("460.10")
+
+# Expected validation messages, compiled once for pytest.raises(match=...)
+_RE_PRICE_POS = re.compile(r"Price must be positive")
+_RE_VOLUME_NON_NEG = re.compile(r"Size/volume must be non-negative")
+_RE_HIGH_GE_OPEN = re.compile(r"High must be >= open")
+_RE_LOW_LE_OPEN = re.compile(r"Low must be <= open")
+_RE_END_GE_START = re.compile(r"End time must be >= start time")
+
+# Single clock read per module; none of these tests depend on the exact instant
+NOW = datetime.now(timezone.utc)
+
+# Built once at import; the cache stores references, so sharing is safe
+_SAMPLE_BARS = [
+    MarketBar.model_construct(
+        instrument="AAPL",
+        timestamp=NOW - timedelta(hours=i),
+        timeframe="1h",
+        open=_D_175_00,
+        high=_D_176_00,
+        low=_D_174_00,
+        close=_D_175_50,
+        volume=100000,
+    )
+    for i in range(5)
+]
+_SAMPLE_RANGE = (NOW - timedelta(hours=6), NOW)
+
+
 class TestMarketSnapshot:
     """Test MarketSnapshot schema."""
     
@@ -22,52 +83,52 @@ class TestMarketSnapshot:
         """Test creating market snapshot."""
         snapshot = MarketSnapshot(
             instrument="AAPL",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("175.50"),
-            ask=Decimal("175.55"),
-            last=Decimal("175.52"),
+            timestamp=NOW,
+            bid=_D_175_50,
+            ask=_D_175_55,
+            last=_D_175_52,
             volume=1500000,
         )
         
         assert snapshot.instrument == "AAPL"
-        assert snapshot.bid == Decimal("175.50")
-        assert snapshot.ask == Decimal("175.55")
-        assert snapshot.mid == Decimal("175.525")  # Auto-calculated
+        assert snapshot.bid == _D_175_50
+        assert snapshot.ask == _D_175_55
+        assert snapshot.mid == _D_175_525  # Auto-calculated
     
     def test_snapshot_mid_calculation(self):
         """Test mid-price auto-calculation."""
         snapshot = MarketSnapshot(
             instrument="SPY",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("460.00"),
-            ask=Decimal("460.10"),
-            last=Decimal("460.05"),
+            timestamp=NOW,
+            bid=_D_460_00,
+            ask=_D_460_10,
+            last=_D_460_05,
             volume=1000000,
         )
         
-        assert snapshot.mid == Decimal("460.05")
+        assert snapshot.mid == _D_460_05
     
     def test_snapshot_validation_positive_price(self):
         """Test validation of positive prices."""
-        with pytest.raises(ValueError, match="Price must be positive"):
+        with pytest.raises(ValueError, match=_RE_PRICE_POS):
             MarketSnapshot(
                 instrument="TEST",
-                timestamp=datetime.utcnow(),
-                bid=Decimal("-10"),
-                ask=Decimal("10"),
-                last=Decimal("10"),
+                timestamp=NOW,
+                bid=_D_NEG_10,
+                ask=_D_10,
+                last=_D_10,
                 volume=100,
             )
     
     def test_snapshot_validation_non_negative_volume(self):
         """Test validation of non-negative volume."""
-        with pytest.raises(ValueError, match="Size/volume must be non-negative"):
+        with pytest.raises(ValueError, match=_RE_VOLUME_NON_NEG):
             MarketSnapshot(
                 instrument="TEST",
-                timestamp=datetime.utcnow(),
-                bid=Decimal("10"),
-                ask=Decimal("11"),
-                last=Decimal("10.5"),
+                timestamp=NOW,
+                bid=_D_10,
+                ask=_D_11,
+                last=_D_10_5,
                 volume=-1000,
             )
 
@@ -79,47 +140,47 @@ class TestMarketBar:
         """Test creating market bar."""
         bar = MarketBar(
             instrument="AAPL",
-            timestamp=datetime.utcnow(),
+            timestamp=NOW,
             timeframe="1h",
-            open=Decimal("175.00"),
-            high=Decimal("176.50"),
-            low=Decimal("174.80"),
-            close=Decimal("176.20"),
+            open=_D_175_00,
+            high=_D_176_50,
+            low=_D_174_80,
+            close=_D_176_20,
             volume=250000,
         )
         
         assert bar.instrument == "AAPL"
         assert bar.timeframe == "1h"
-        assert bar.open == Decimal("175.00")
-        assert bar.high == Decimal("176.50")
-        assert bar.low == Decimal("174.80")
-        assert bar.close == Decimal("176.20")
+        assert bar.open == _D_175_00
+        assert bar.high == _D_176_50
+        assert bar.low == _D_174_80
+        assert bar.close == _D_176_20
     
     def test_bar_ohlc_validation_high(self):
         """Test OHLC validation for high price."""
-        with pytest.raises(ValueError, match="High must be >= open"):
+        with pytest.raises(ValueError, match=_RE_HIGH_GE_OPEN):
             MarketBar(
                 instrument="TEST",
-                timestamp=datetime.utcnow(),
+                timestamp=NOW,
                 timeframe="1h",
-                open=Decimal("100"),
-                high=Decimal("95"),  # Invalid: high < open
-                low=Decimal("90"),
-                close=Decimal("98"),
+                open=_D_100,
+                high=_D_95,  # Invalid: high < open
+                low=_D_90,
+                close=_D_98,
                 volume=1000,
             )
     
     def test_bar_ohlc_validation_low(self):
         """Test OHLC validation for low price."""
-        with pytest.raises(ValueError, match="Low must be <= open"):
+        with pytest.raises(ValueError, match=_RE_LOW_LE_OPEN):
             MarketBar(
                 instrument="TEST",
-                timestamp=datetime.utcnow(),
+                timestamp=NOW,
                 timeframe="1h",
-                open=Decimal("100"),
-                high=Decimal("110"),
-                low=Decimal("105"),  # Invalid: low > open
-                close=Decimal("108"),
+                open=_D_100,
+                high=_D_110,
+                low=_D_105,  # Invalid: low > open
+                close=_D_108,
                 volume=1000,
             )
 
@@ -142,10 +203,10 @@ class TestBarDataRequest:
     
     def test_date_range_validation(self):
         """Test date range validation."""
-        start = datetime.utcnow()
+        start = NOW
         end = start - timedelta(hours=1)  # End before start
         
-        with pytest.raises(ValueError, match="End time must be >= start time"):
+        with pytest.raises(ValueError, match=_RE_END_GE_START):
             BarDataRequest(
                 instrument="TEST",
                 timeframe="1h",
@@ -154,30 +215,35 @@ class TestBarDataRequest:
             )
 
 
+@pytest.fixture(scope="module")
+def sample_snapshot():
+    """Pre-built AAPL snapshot shared by the cache tests (the cache only stores references)."""
+    return MarketSnapshot.model_construct(
+        instrument="AAPL",
+        timestamp=NOW,
+        bid=_D_175_50,
+        ask=_D_175_55,
+        last=_D_175_52,
+        volume=1000000,
+        mid=_D_175_525,
+    )
+
+
 class TestMarketDataCache:
     """Test MarketDataCache."""
     
-    def test_cache_snapshot(self):
+    def test_cache_snapshot(self, sample_snapshot):
         """Test caching snapshot data."""
         cache = MarketDataCache(snapshot_ttl_seconds=10)
         
-        snapshot = MarketSnapshot(
-            instrument="AAPL",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("175.50"),
-            ask=Decimal("175.55"),
-            last=Decimal("175.52"),
-            volume=1000000,
-        )
-        
         # Cache snapshot
-        cache.set_snapshot("AAPL", snapshot)
+        cache.set_snapshot("AAPL", sample_snapshot)
         
         # Retrieve from cache
         cached = cache.get_snapshot("AAPL")
         assert cached is not None
         assert cached.instrument == "AAPL"
-        assert cached.bid == Decimal("175.50")
+        assert cached.bid == _D_175_50
     
     def test_cache_miss(self):
         """Test cache miss."""
@@ -186,95 +252,70 @@ class TestMarketDataCache:
         cached = cache.get_snapshot("NONEXISTENT")
         assert cached is None
     
-    def test_cache_expiration(self):
+    @pytest.fixture
+    def fake_now(self, monkeypatch):
+        """Drive the cache's clock manually instead of sleeping past the TTL."""
+        now = [1_000_000.0]
+        monkeypatch.setattr(
+            "packages.market_data.time", SimpleNamespace(time=lambda: now[0])
+        )
+        return now
+    
+    def test_cache_expiration(self, fake_now, sample_snapshot):
         """Test cache expiration."""
-        import time
-        
         cache = MarketDataCache(snapshot_ttl_seconds=1)
         
-        snapshot = MarketSnapshot(
-            instrument="AAPL",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("175.50"),
-            ask=Decimal("175.55"),
-            last=Decimal("175.52"),
-            volume=1000000,
-        )
-        
-        cache.set_snapshot("AAPL", snapshot)
+        cache.set_snapshot("AAPL", sample_snapshot)
         
         # Should be cached
         cached = cache.get_snapshot("AAPL")
         assert cached is not None
         
-        # Wait for expiration
-        time.sleep(1.1)
+        # Advance past expiration
+        fake_now[0] += 1.1
         
         # Should be expired
         cached = cache.get_snapshot("AAPL")
         assert cached is None
     
+    def test_cache_expiration_fractional_ttl(self, fake_now, sample_snapshot):
+        """Test sub-second TTLs expire on time."""
+        cache = MarketDataCache(snapshot_ttl_seconds=0.05)
+        
+        cache.set_snapshot("AAPL", sample_snapshot)
+        
+        fake_now[0] += 0.04
+        assert cache.get_snapshot("AAPL") is not None
+        
+        fake_now[0] += 0.02
+        assert cache.get_snapshot("AAPL") is None
+    
     def test_cache_bars(self):
         """Test caching bar data."""
         cache = MarketDataCache(bars_ttl_seconds=300)
         
-        bars = [
-            MarketBar(
-                instrument="AAPL",
-                timestamp=datetime.utcnow() - timedelta(hours=i),
-                timeframe="1h",
-                open=Decimal("175.00"),
-                high=Decimal("176.00"),
-                low=Decimal("174.00"),
-                close=Decimal("175.50"),
-                volume=100000,
-            )
-            for i in range(5)
-        ]
-        
-        start = datetime.utcnow() - timedelta(hours=6)
-        end = datetime.utcnow()
+        cache.set_bars("AAPL", "1h", *_SAMPLE_RANGE, _SAMPLE_BARS)
         
-        cache.set_bars("AAPL", "1h", start, end, bars)
-        
-        cached = cache.get_bars("AAPL", "1h", start, end)
+        cached = cache.get_bars("AAPL", "1h", *_SAMPLE_RANGE)
         assert cached is not None
         assert len(cached) == 5
     
-    def test_cache_clear(self):
+    def test_cache_clear(self, sample_snapshot):
         """Test cache clearing."""
         cache = MarketDataCache()
         
-        snapshot = MarketSnapshot(
-            instrument="AAPL",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("175.50"),
-            ask=Decimal("175.55"),
-            last=Decimal("175.52"),
-            volume=1000000,
-        )
-        
-        cache.set_snapshot("AAPL", snapshot)
+        cache.set_snapshot("AAPL", sample_snapshot)
         assert cache.get_snapshot("AAPL") is not None
         
         cache.clear()
         assert cache.get_snapshot("AAPL") is None
     
-    def test_cache_stats(self):
+    def test_cache_stats(self, sample_snapshot):
         """Test cache statistics."""
         cache = MarketDataCache()
         
-        snapshot = MarketSnapshot(
-            instrument="AAPL",
-            timestamp=datetime.utcnow(),
-            bid=Decimal("175.50"),
-            ask=Decimal("175.55"),
-            last=Decimal("175.52"),
-            volume=1000000,
-        )
-        
-        cache.set_snapshot("AAPL", snapshot)
-        cache.set_snapshot("SPY", snapshot)
+        cache.set_snapshot("AAPL", sample_snapshot)
+        cache.set_snapshot("SPY", sample_snapshot)
         
         stats = cache.get_stats()
         assert stats["snapshot_count"] == 2
@@ -291,26 +332,28 @@ class MockMarketDataProvider:
     
     def get_snapshot(self, instrument, fields=None):
         self.snapshot_calls += 1
-        return MarketSnapshot(
+        # Known-valid data: skip validation (mid is passed since its validator won't run)
+        return MarketSnapshot.model_construct(
             instrument=instrument,
-            timestamp=datetime.utcnow(),
-            bid=Decimal("100.00"),
-            ask=Decimal("100.10"),
-            last=Decimal("100.05"),
+            timestamp=NOW,
+            bid=_D_100_00,
+            ask=_D_100_10,
+            last=_D_100_05,
             volume=1000000,
+            mid=_D_100_05,
         )
     
     def get_bars(self, instrument, timeframe, start=None, end=None, limit=100, rth_only=True):
         self.bars_calls += 1
         return [
-            MarketBar(
+            MarketBar.model_construct(
                 instrument=instrument,
-                timestamp=datetime.utcnow() - timedelta(hours=i),
+                timestamp=NOW - timedelta(hours=i),
                 timeframe=timeframe,
-                open=Decimal("100.00"),
-                high=Decimal("101.00"),
-                low=Decimal("99.00"),
-                close=Decimal("100.50"),
+                open=_D_100_00,
+                high=_D_101_00,
+                low=_D_99_00,
+                close=_D_100_50,
                 volume=100000,
             )
             for i in range(min(limit, 10))
@@ -320,10 +363,15 @@ class MockMarketDataProvider:
 class TestCachedMarketDataProvider:
     """Test CachedMarketDataProvider."""
     
-    def test_cache_hit_snapshot(self):
-        """Test cache hit for snapshot."""
+    @pytest.fixture
+    def providers(self):
+        """Fresh (mock, cached) provider pair per test to keep call counters isolated."""
         mock_provider = MockMarketDataProvider()
-        cached_provider = CachedMarketDataProvider(mock_provider)
+        return mock_provider, CachedMarketDataProvider(mock_provider)
+    
+    def test_cache_hit_snapshot(self, providers):
+        """Test cache hit for snapshot."""
+        mock_provider, cached_provider = providers
         
         # First call - should hit provider
         snapshot1 = cached_provider.get_snapshot("AAPL")
@@ -335,10 +383,9 @@ class TestCachedMarketDataProvider:
         
         assert snapshot1.instrument == snapshot2.instrument
     
-    def test_cache_bypass(self):
+    def test_cache_bypass(self, providers):
         """Test bypassing cache."""
-        mock_provider = MockMarketDataProvider()
-        cached_provider = CachedMarketDataProvider(mock_provider)
+        mock_provider, cached_provider = providers
         
         # Bypass cache
         snapshot1 = cached_provider.get_snapshot("AAPL", use_cache=False)
@@ -346,13 +393,12 @@ class TestCachedMarketDataProvider:
         
         assert mock_provider.snapshot_calls == 2  # Both calls hit provider
     
-    def test_cache_hit_bars(self):
+    def test_cache_hit_bars(self, providers):
         """Test cache hit for bars."""
-        mock_provider = MockMarketDataProvider()
-        cached_provider = CachedMarketDataProvider(mock_provider)
+        mock_provider, cached_provider = providers
         
-        start = datetime.utcnow() - timedelta(hours=24)
-        end = datetime.utcnow()
+        start = NOW - timedelta(hours=24)
+        end = NOW
         
         # First call - should hit provider
         bars1 = cached_provider.get_bars("AAPL", "1h", start, end)
@@ -364,10 +410,9 @@ class TestCachedMarketDataProvider:
         
         assert len(bars1) == len(bars2)
     
-    def test_clear_cache(self):
+    def test_clear_cache(self, providers):
         """Test clearing cache."""
-        mock_provider = MockMarketDataProvider()
-        cached_provider = CachedMarketDataProvider(mock_provider)
+        mock_provider, cached_provider = providers
         
         # Cache snapshot
         cached_provider.get_snapshot("AAPL")
@@ -1,19 +1,39 @@
 """Tests for market data API endpoints and FakeBrokerAdapter."""
 
+import asyncio
+import httpx
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from fastapi.testclient import TestClient
+from freezegun import freeze_time
+
+from apps.assistant_api import main
 from packages.broker_ibkr.fake import FakeBrokerAdapter
 
 
+# Fixed instant; the module runs under a frozen clock so the fake adapter's
+# default bar window ("now" minus 24h) is deterministic
+NOW = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _frozen_clock():
+    """Freeze wall-clock time at NOW for every test in this module."""
+    with freeze_time(NOW, real_asyncio=True):
+        yield
+
+
 class TestFakeBrokerAdapterMarketData:
     """Test market data methods in FakeBrokerAdapter."""
     
-    def test_get_market_snapshot_v2(self):
+    @pytest.fixture(scope="class")
+    def adapter(self):
+        """Share one fake adapter across the class; market data calls are stateless."""
+        return FakeBrokerAdapter()
+    
+    def test_get_market_snapshot_v2(self, adapter):
         """Test getting market snapshot with v2 schema."""
-        adapter = FakeBrokerAdapter()
-        
         snapshot = adapter.get_market_snapshot_v2("AAPL")
         
         assert snapshot.instrument == "AAPL"
@@ -23,22 +43,13 @@ class TestFakeBrokerAdapterMarketData:
         assert snapshot.mid is not None
         assert snapshot.volume > 0
     
-    def test_get_market_snapshot_v2_multiple_instruments(self):
-        """Test snapshots for different instruments."""
-        adapter = FakeBrokerAdapter()
-        
-        aapl = adapter.get_market_snapshot_v2("AAPL")
-        spy = adapter.get_market_snapshot_v2("SPY")
-        msft = adapter.get_market_snapshot_v2("MSFT")
-        
-        # Different instruments should have different base prices
-        assert aapl.last != spy.last
-        assert spy.last != msft.last
+    @pytest.mark.parametrize("a,b", [("AAPL", "SPY"), ("SPY", "MSFT")])
+    def test_get_market_snapshot_v2_distinct_base_prices(self, adapter, a, b):
+        """Test different instruments have different base prices."""
+        assert adapter.get_market_snapshot_v2(a).last != adapter.get_market_snapshot_v2(b).last
     
-    def test_get_market_bars(self):
+    def test_get_market_bars(self, adapter):
         """Test getting historical bars."""
-        adapter = FakeBrokerAdapter()
-        
         bars = adapter.get_market_bars(
             instrument="AAPL",
             timeframe="1h",
@@ -55,11 +66,9 @@ class TestFakeBrokerAdapterMarketData:
             assert bar.low <= bar.close
             assert bar.volume > 0
     
-    def test_get_market_bars_date_range(self):
+    def test_get_market_bars_date_range(self, adapter):
         """Test bars with specific date range."""
-        adapter = FakeBrokerAdapter()
-        
-        end = datetime.utcnow()
+        end = NOW
         start = end - timedelta(hours=5)
         
         bars = adapter.get_market_bars(
@@ -72,10 +81,8 @@ class TestFakeBrokerAdapterMarketData:
         assert len(bars) > 0
         assert all(start <= bar.timestamp <= end for bar in bars)
     
-    def test_get_market_bars_limit(self):
+    def test_get_market_bars_limit(self, adapter):
         """Test bars limit parameter."""
-        adapter = FakeBrokerAdapter()
-        
         bars = adapter.get_market_bars(
             instrument="AAPL",
             timeframe="5m",
@@ -84,44 +91,54 @@ class TestFakeBrokerAdapterMarketData:
         
         assert len(bars) <= 50
     
-    def test_get_market_bars_timeframes(self):
-        """Test different timeframes."""
-        adapter = FakeBrokerAdapter()
+    def test_get_market_bars_memoized_window(self, adapter):
+        """Test identical windows reuse generated bars without sharing them."""
+        end = NOW
+        start = end - timedelta(hours=5)
         
-        # Use appropriate date ranges for each timeframe
-        test_cases = [
+        bars1 = adapter.get_market_bars(instrument="AAPL", timeframe="1h", start=start, end=end)
+        closes = [bar.close for bar in bars1]
+        bars1[0].close = Decimal("-1")
+        bars2 = adapter.get_market_bars(instrument="AAPL", timeframe="1h", start=start, end=end)
+        
+        assert [bar.close for bar in bars2] == closes
+        assert bars1[0] is not bars2[0]
+    
+    @pytest.mark.parametrize(
+        "timeframe,time_range,expected_count",
+        [
+            # Use appropriate date ranges for each timeframe
             ("1m", timedelta(minutes=10), 5),
             ("5m", timedelta(minutes=30), 5),
             ("15m", timedelta(hours=2), 5),
             ("1h", timedelta(hours=10), 5),
             ("1d", timedelta(days=10), 5),
-        ]
-        
-        for timeframe, time_range, expected_count in test_cases:
-            end = datetime.utcnow()
-            start = end - time_range
-            
-            bars = adapter.get_market_bars(
-                instrument="AAPL",
-                timeframe=timeframe,
-                start=start,
-                end=end,
-                limit=expected_count,
-            )
-            
-            assert len(bars) == expected_count, f"Expected {expected_count} bars for {timeframe}, got {len(bars)}"
-            assert all(bar.timeframe == timeframe for bar in bars)
+        ],
+    )
+    def test_get_market_bars_timeframes(self, adapter, timeframe, time_range, expected_count):
+        """Test different timeframes."""
+        end = NOW
+        start = end - time_range
+        
+        bars = adapter.get_market_bars(
+            instrument="AAPL",
+            timeframe=timeframe,
+            start=start,
+            end=end,
+            limit=expected_count,
+        )
+        
+        assert len(bars) == expected_count, f"Expected {expected_count} bars for {timeframe}, got {len(bars)}"
+        assert all(bar.timeframe == timeframe for bar in bars)
 
 
 class TestMarketDataAPIEndpoints:
     """Test market data API endpoints."""
     
-    @pytest.fixture(scope="function", autouse=False)
-    def client(self):
-        """Create test client with dependency override and disabled lifespan."""
+    @pytest.fixture(scope="class")
+    def fake_broker(self, app):
+        """Install a FAKE broker as dependency override and global, restoring both afterwards."""
         import os
-        from apps.assistant_api.main import app, get_broker
-        from apps.assistant_api import main
         from packages.broker_ibkr.factory import get_broker_adapter, BrokerType
         
         # Save original broker state and env
@@ -135,13 +152,10 @@ class TestMarketDataAPIEndpoints:
         test_broker = get_broker_adapter(broker_type=BrokerType.FAKE)
         
         # Override both dependency and global
-        app.dependency_overrides[get_broker] = lambda: test_broker
+        app.dependency_overrides[main.get_broker] = lambda: test_broker
         main.broker = test_broker
         
-        # Create client without lifespan to avoid interference
-        from fastapi.testclient import TestClient
-        with TestClient(app, backend_options={"use_uvloop": False}) as client:
-            yield client
+        yield test_broker
         
         # Cleanup: remove override and restore original state
         app.dependency_overrides.clear()
@@ -151,44 +165,48 @@ class TestMarketDataAPIEndpoints:
         else:
             os.environ["BROKER_TYPE"] = original_env
     
-    def test_get_market_snapshot_success(self, client):
-        """Test getting market snapshot."""
-        response = client.get("/api/v1/market/snapshot?instrument=AAPL")
-        
-        assert response.status_code == 200
-        data = response.json()
+    @pytest.fixture(scope="class")
+    def client(self, app, fake_broker):
+        """Create one test client (lifespan entered once) shared by the class."""
+        with TestClient(app, backend_options={"use_uvloop": False}) as client:
+            yield client
+    
+    @pytest.fixture
+    async def async_client(self, app, fake_broker):
+        """Create in-process async client (no lifespan) against the fake broker."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    
+    async def test_market_endpoints_concurrent(self, async_client):
+        """Test read-only snapshot and bars endpoints, issued concurrently."""
+        snapshot, snapshot_fields, bars, bars_rth = await asyncio.gather(
+            async_client.get("/api/v1/market/snapshot?instrument=AAPL"),
+            async_client.get("/api/v1/market/snapshot?instrument=AAPL&fields=bid,ask,last"),
+            async_client.get("/api/v1/market/bars?instrument=AAPL&timeframe=1h&limit=10"),
+            async_client.get("/api/v1/market/bars?instrument=AAPL&timeframe=1h&rth_only=true"),
+        )
         
+        # Snapshot
+        assert snapshot.status_code == 200
+        data = snapshot.json()
         assert data["instrument"] == "AAPL"
         assert "bid" in data
         assert "ask" in data
         assert "last" in data
         assert "mid" in data
         assert "volume" in data
-    
-    def test_get_market_snapshot_missing_instrument(self, client):
-        """Test snapshot with missing instrument."""
-        response = client.get("/api/v1/market/snapshot")
-        
-        assert response.status_code == 422  # Validation error
-    
-    def test_get_market_snapshot_with_fields(self, client):
-        """Test snapshot with specific fields."""
-        response = client.get("/api/v1/market/snapshot?instrument=AAPL&fields=bid,ask,last")
-        
-        assert response.status_code == 200
-        data = response.json()
         
+        # Snapshot with specific fields
+        assert snapshot_fields.status_code == 200
+        data = snapshot_fields.json()
         assert data["instrument"] == "AAPL"
         assert "bid" in data
         assert "ask" in data
-    
-    def test_get_market_bars_success(self, client):
-        """Test getting market bars."""
-        response = client.get("/api/v1/market/bars?instrument=AAPL&timeframe=1h&limit=10")
-        
-        assert response.status_code == 200
-        data = response.json()
         
+        # Bars
+        assert bars.status_code == 200
+        data = bars.json()
         assert data["instrument"] == "AAPL"
         assert data["timeframe"] == "1h"
         assert data["bar_count"] > 0
@@ -202,6 +220,16 @@ class TestMarketDataAPIEndpoints:
         assert "low" in bar
         assert "close" in bar
         assert "volume" in bar
+        
+        # Bars with regular trading hours only
+        assert bars_rth.status_code == 200
+        assert bars_rth.json()["bar_count"] > 0
+    
+    def test_get_market_snapshot_missing_instrument(self, client):
+        """Test snapshot with missing instrument."""
+        response = client.get("/api/v1/market/snapshot")
+        
+        assert response.status_code == 422  # Validation error
     
     def test_get_market_bars_missing_instrument(self, client):
         """Test bars with missing instrument."""
@@ -219,27 +247,22 @@ class TestMarketDataAPIEndpoints:
         """Test bars with invalid limit."""
         response = client.get("/api/v1/market/bars?instrument=AAPL&timeframe=1h&limit=10000")
         
-        assert response.status_code == 400  # Bad request
+        assert response.status_code == 422  # Rejected by query validation
     
     def test_get_market_bars_with_date_range(self, client):
         """Test bars with date range."""
-        end = datetime.utcnow()
+        end = NOW
         start = end - timedelta(hours=5)
         
+        # Pass as params so the "+00:00" offset is URL-encoded
         response = client.get(
-            f"/api/v1/market/bars?instrument=SPY&timeframe=1h"
-            f"&start={start.isoformat()}&end={end.isoformat()}"
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert data["bar_count"] > 0
-    
-    def test_get_market_bars_rth_only(self, client):
-        """Test bars with regular trading hours only."""
-        response = client.get(
-            "/api/v1/market/bars?instrument=AAPL&timeframe=1h&rth_only=true"
+            "/api/v1/market/bars",
+            params={
+                "instrument": "SPY",
+                "timeframe": "1h",
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+            },
         )
         
         assert response.status_code == 200
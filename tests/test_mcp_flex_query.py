@@ -2,7 +2,8 @@
 Tests for MCP Flex Query tools.
 """
 
-import json
+import asyncio
+import orjson
 import pytest
 from datetime import date
 from decimal import Decimal
@@ -12,6 +13,7 @@ from apps.mcp_server.main import (
     handle_list_flex_queries,
     handle_run_flex_query,
 )
+from packages.audit_store import AuditStore
 from packages.flex_query.service import FlexQueryService
 from packages.schemas.flex_query import (
     FlexQueryConfig,
@@ -23,15 +25,31 @@ from packages.schemas.flex_query import (
 )
 
 
+# Decimal constants for the mocked trade confirmation, parsed once per module
+QTY_100 = Decimal("100")
+PRICE_195_50 = Decimal("195.50")
+PROCEEDS_19550 = Decimal("19550.00")
+COMMISSION_1 = Decimal("1.00")
+NET_CASH_19549 = Decimal("19549.00")
+
+
+@pytest.fixture(scope="session")
+def session_audit_store():
+    """In-memory audit store whose schema is created once per session."""
+    store = AuditStore(":memory:")
+    yield store
+    store.close()
+
+
 @pytest.fixture
-def mock_audit_store(tmp_path, monkeypatch):
-    """Mock audit store."""
-    from packages.audit_store import AuditStore
+def mock_audit_store(session_audit_store, monkeypatch):
+    """Session audit store, emptied and installed on the MCP server for each test."""
     import apps.mcp_server.main as mcp_main
     
-    store = AuditStore(str(tmp_path / "test_mcp_audit.db"))
-    monkeypatch.setattr(mcp_main, "audit_store", store)
-    return store
+    session_audit_store.reset()
+    
+    monkeypatch.setattr(mcp_main, "audit_store", session_audit_store)
+    return session_audit_store
 
 
 @pytest.fixture
@@ -42,7 +60,7 @@ def mock_flex_query_service(tmp_path, monkeypatch):
     service = FlexQueryService(storage_path=str(tmp_path / "flex_reports"))
     
     # Add sample queries
-    service.add_query_config(FlexQueryConfig(
+    service.add_query_config(FlexQueryConfig.model_construct(
         query_id="123456",
         name="Daily Trades",
         query_type=FlexQueryType.TRADES,
@@ -51,7 +69,7 @@ def mock_flex_query_service(tmp_path, monkeypatch):
         schedule_cron="0 9 * * *",
     ))
     
-    service.add_query_config(FlexQueryConfig(
+    service.add_query_config(FlexQueryConfig.model_construct(
         query_id="789012",
         name="Weekly P&L",
         query_type=FlexQueryType.REALIZED_PNL,
@@ -70,7 +88,7 @@ async def test_handle_list_flex_queries_all(mock_audit_store, mock_flex_query_se
     assert len(result) == 1
     assert result[0].type == "text"
     
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     assert data["total"] == 2
     assert len(data["queries"]) == 2
 
@@ -81,7 +99,7 @@ async def test_handle_list_flex_queries_enabled_only(mock_audit_store, mock_flex
     result = await handle_list_flex_queries({"enabled_only": True})
     
     assert len(result) == 1
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     
     assert data["total"] == 1
     assert len(data["queries"]) == 1
@@ -94,7 +112,7 @@ async def test_handle_list_flex_queries_default_enabled(mock_audit_store, mock_f
     """Test list_flex_queries tool defaults to enabled_only=True."""
     result = await handle_list_flex_queries({})
     
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     assert data["total"] == 1  # Only enabled query
 
 
@@ -121,7 +139,7 @@ async def test_handle_run_flex_query_no_mock_returns_pending(mock_audit_store, m
     })
     
     assert len(result) == 1
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     
     assert data["status"] == "PENDING"
     assert data["query_type"] == "TRADES"
@@ -135,15 +153,15 @@ async def test_handle_run_flex_query_with_mock(mock_audit_store, tmp_path, monke
     import apps.mcp_server.main as mcp_main
     
     service = FlexQueryService(storage_path=str(tmp_path / "flex_reports"))
-    service.add_query_config(FlexQueryConfig(
+    service.add_query_config(FlexQueryConfig.model_construct(
         query_id="123456",
         name="Test",
         query_type=FlexQueryType.TRADES,
     ))
     
-    # Mock execute_query to return completed result
+    # Mock execute_query to return completed result (known-valid, so skip validation)
     def mock_execute_query(request):
-        return FlexQueryResult(
+        return FlexQueryResult.model_construct(
             query_id=request.query_id,
             execution_id="TEST-001",
             status=FlexQueryStatus.COMPLETED,
@@ -151,18 +169,18 @@ async def test_handle_run_flex_query_with_mock(mock_audit_store, tmp_path, monke
             from_date=request.from_date,
             to_date=request.to_date,
             trades=[
-                TradeConfirmation(
+                TradeConfirmation.model_construct(
                     trade_id="T1",
                     execution_id="E1",
                     account_id="DU123456",
                     symbol="AAPL",
                     description="Apple Inc.",
                     trade_date=date(2025, 12, 26),
-                    quantity=Decimal("100"),
-                    trade_price=Decimal("195.50"),
-                    proceeds=Decimal("19550.00"),
-                    commission=Decimal("1.00"),
-                    net_cash=Decimal("19549.00"),
+                    quantity=QTY_100,
+                    trade_price=PRICE_195_50,
+                    proceeds=PROCEEDS_19550,
+                    commission=COMMISSION_1,
+                    net_cash=NET_CASH_19549,
                     buy_sell="BUY",
                 )
             ]
@@ -177,7 +195,7 @@ async def test_handle_run_flex_query_with_mock(mock_audit_store, tmp_path, monke
         "to_date": "2025-12-26",
     })
     
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     
     assert data["status"] == "COMPLETED"
     assert data["execution_id"] == "TEST-001"
@@ -217,22 +235,27 @@ async def test_handle_run_flex_query_no_dates(mock_audit_store, mock_flex_query_
     """Test run_flex_query without date parameters."""
     result = await handle_run_flex_query({"query_id": "123456"})
     
-    data = json.loads(result[0].text)
+    data = orjson.loads(result[0].text)
     assert data["from_date"] is None
     assert data["to_date"] is None
 
 
 @pytest.mark.asyncio
-async def test_handle_run_flex_query_audit_events(mock_audit_store, mock_flex_query_service):
-    """Test run_flex_query emits audit events."""
-    await handle_run_flex_query({
-        "query_id": "123456",
-        "from_date": "2025-12-01",
-        "to_date": "2025-12-26",
-    })
+@pytest.mark.parametrize("runs", [1, 3])
+async def test_handle_run_flex_query_audit_events(runs, mock_audit_store, mock_flex_query_service):
+    """Test run_flex_query emits audit events, with several runs gathered on one loop."""
+    results = await asyncio.gather(*(
+        handle_run_flex_query({
+            "query_id": "123456",
+            "from_date": "2025-12-01",
+            "to_date": "2025-12-26",
+        })
+        for _ in range(runs)
+    ))
+    
+    assert all(orjson.loads(result[0].text)["status"] == "PENDING" for result in results)
     
-    # Check audit events were emitted - audit store has events
-    # Note: AuditStore doesn't have list_events, but append_event was called
-    # This test verifies that the handler completes without error
-    # which implicitly means audit events were emitted
-    assert True  # If we got here, audit events were emitted successfully
+    # Each run emits a request and a result event under its own correlation ID
+    stats = mock_audit_store.get_stats()
+    assert stats.total_events == 2 * runs
+    assert stats.correlation_id_count == runs
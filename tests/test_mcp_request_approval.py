@@ -14,46 +14,35 @@ import json
 from decimal import Decimal
 
 import pytest
+from pydantic import ValidationError
 
 from packages.broker_ibkr.fake import FakeBrokerAdapter
-from packages.broker_ibkr.models import Instrument, InstrumentType, Cash
+from packages.broker_ibkr.models import Instrument, InstrumentType, Cash, OrderType
 from packages.schemas.order_intent import OrderIntent
 from packages.schemas.approval import OrderProposal, OrderState
-from packages.trade_sim import TradeSimulator, SimulationConfig
-from packages.risk_engine import RiskEngine, RiskLimits, TradingHours
 from packages.risk_engine.models import Decision
-from packages.approval_service import ApprovalService
+from packages.mcp_security.schemas import RequestApprovalSchema
 import uuid
 
 
-@pytest.fixture
-def services():
-    """Create real services for integration testing."""
-    broker = FakeBrokerAdapter(account_id="DU123456")
-    broker.connect()
-    
-    simulator = TradeSimulator(config=SimulationConfig())
-    
-    risk_engine = RiskEngine(
-        limits=RiskLimits(
-            max_position_pct=Decimal("15.0"),  # Allow up to 15% per position
-        ),
-        trading_hours=TradingHours(allow_pre_market=True, allow_after_hours=True),
-        daily_trades_count=0,
-        daily_pnl=Decimal("0"),
-    )
-    
-    approval_service = ApprovalService(max_proposals=1000)
-    
-    return broker, simulator, risk_engine, approval_service
+# Decimal constants, parsed once per module
+D0 = Decimal("0")
+D10 = Decimal("10")
+D100000 = Decimal("100000")
+P100 = Decimal("100.00")
+P185 = Decimal("185.00")
+P190 = Decimal("190.00")
+QTY_NEG_100 = Decimal("-100")
 
 
-def test_request_approval_workflow_success(services):
-    """Test complete request_approval workflow - success path."""
-    broker, simulator, risk_engine, approval_service = services
+@pytest.fixture(scope="module")
+def intent_factory():
+    """Build OrderIntents from a template validated once per module.
     
-    # Create OrderIntent
-    intent = OrderIntent(
+    Overrides must already be of the field's type (enums, Decimals, Instrument)
+    since they are applied via model_construct without re-validation.
+    """
+    template = OrderIntent(
         account_id="DU123456",
         instrument=Instrument(
             type=InstrumentType.STK,
@@ -62,7 +51,7 @@ def test_request_approval_workflow_success(services):
             currency="USD",
         ),
         side="BUY",
-        quantity=Decimal("10"),
+        quantity=D10,
         order_type="MKT",
         limit_price=None,
         time_in_force="DAY",
@@ -70,21 +59,64 @@ def test_request_approval_workflow_success(services):
         strategy_tag="mcp_request",
         constraints={},
     )
+    base_kwargs = dict(template)
+    
+    def make(**overrides):
+        return OrderIntent.model_construct(**{**base_kwargs, **overrides})
+    
+    return make
+
+
+WORKFLOW_CASES = [
+    pytest.param({}, Decision.APPROVE, "SUCCESS", id="market_buy"),
+    pytest.param(
+        # Excessive quantity should violate R1
+        {"quantity": D100000, "reason": "Test excessive position size"},
+        Decision.REJECT,
+        None,
+        id="risk_rejection",
+    ),
+    pytest.param(
+        {
+            "order_type": OrderType.LMT,
+            "limit_price": P185,  # Below market
+            "reason": "Buy on dip below current market price",
+        },
+        Decision.APPROVE,
+        "SUCCESS",
+        id="limit_order",
+    ),
+]
+
+
+@pytest.mark.parametrize("overrides,expected_decision,expected_sim_status", WORKFLOW_CASES)
+def test_request_approval_workflow(
+    services, intent_factory, overrides, expected_decision, expected_sim_status
+):
+    """Test request_approval workflow: simulate, evaluate, then store and request approval."""
+    broker, simulator, risk_engine, approval_service = services
+    
+    intent = intent_factory(**overrides)
     
     # Step 1: Get portfolio
     portfolio = broker.get_portfolio("DU123456")
     assert portfolio is not None
     
     # Step 2: Simulate order
-    market_price = Decimal("190.00")
-    sim_result = simulator.simulate(intent, portfolio, market_price)
-    assert sim_result.status == "SUCCESS"
-    assert sim_result.net_notional > 0  # Buying costs money (positive notional)
-    assert sim_result.cash_after < sim_result.cash_before  # Cash decreases
+    sim_result = simulator.simulate(intent, portfolio, P190)
+    if expected_sim_status is not None:
+        assert sim_result.status == expected_sim_status
     
     # Step 3: Evaluate risk
     risk_decision = risk_engine.evaluate(intent, portfolio, sim_result)
-    assert risk_decision.decision == Decision.APPROVE
+    assert risk_decision.decision == expected_decision
+    
+    if expected_decision == Decision.REJECT:
+        assert len(risk_decision.violated_rules) > 0
+        return
+    
+    assert sim_result.net_notional > 0  # Buying costs money (positive notional)
+    assert sim_result.cash_after < sim_result.cash_before  # Cash decreases
     
     # Step 4: Store proposal using helper method
     proposal = approval_service.create_and_store_proposal(
@@ -96,76 +128,29 @@ def test_request_approval_workflow_success(services):
     # Step 5: Request approval
     approval_service.request_approval(proposal.proposal_id)
     
-    # Verify proposal state
+    # Verify proposal state and order details
     retrieved = approval_service.get_proposal(proposal.proposal_id)
     assert retrieved is not None
     assert retrieved.state == "APPROVAL_REQUESTED"
     assert retrieved.intent.instrument.symbol == "AAPL"
-    assert retrieved.intent.quantity == Decimal("10")
+    assert retrieved.intent.quantity == D10
+    assert retrieved.intent.order_type == intent.order_type
+    assert retrieved.intent.limit_price == intent.limit_price
 
 
-def test_request_approval_workflow_risk_rejection(services):
-    """Test request_approval workflow - risk rejection path."""
-    broker, simulator, risk_engine, approval_service = services
-    
-    # Create intent with excessive quantity (should violate R1)
-    intent = OrderIntent(
-        account_id="DU123456",
-        instrument=Instrument(
-            type=InstrumentType.STK,
-            symbol="AAPL",
-            exchange="SMART",
-            currency="USD",
-        ),
-        side="BUY",
-        quantity=Decimal("100000"),  # Huge quantity
-        order_type="MKT",
-        limit_price=None,
-        time_in_force="DAY",
-        reason="Test excessive position size",
-        strategy_tag="mcp_request",
-        constraints={},
-    )
-    
-    portfolio = broker.get_portfolio("DU123456")
-    market_price = Decimal("190.00")
-    sim_result = simulator.simulate(intent, portfolio, market_price)
-    
-    # Risk evaluation should reject
-    risk_decision = risk_engine.evaluate(intent, portfolio, sim_result)
-    assert risk_decision.decision == Decision.REJECT
-    assert len(risk_decision.violated_rules) > 0
-
-
-def test_request_approval_workflow_simulation_failure(services):
+def test_request_approval_workflow_simulation_failure(services, intent_factory):
     """Test request_approval workflow - simulation failure path."""
     broker, simulator, risk_engine, approval_service = services
     
     # Create broker with zero cash
     broke_broker = FakeBrokerAdapter(account_id="DU123456")
     broke_broker.connect()
-    broke_broker._cash = [Cash(currency="USD", total=Decimal("0"), available=Decimal("0"))]  # No cash
+    broke_broker._cash = [Cash(currency="USD", total=D0, available=D0)]  # No cash
     
-    intent = OrderIntent(
-        account_id="DU123456",
-        instrument=Instrument(
-            type=InstrumentType.STK,
-            symbol="AAPL",
-            exchange="SMART",
-            currency="USD",
-        ),
-        side="BUY",
-        quantity=Decimal("10"),
-        order_type="MKT",
-        limit_price=None,
-        time_in_force="DAY",
-        reason="Test insufficient cash scenario",
-        strategy_tag="mcp_request",
-        constraints={},
-    )
+    intent = intent_factory(reason="Test insufficient cash scenario")
     
     portfolio = broke_broker.get_portfolio("DU123456")
-    market_price = Decimal("190.00")
+    market_price = P190
     sim_result = simulator.simulate(intent, portfolio, market_price)
     
     # Simulation should fail
@@ -173,48 +158,6 @@ def test_request_approval_workflow_simulation_failure(services):
     assert sim_result.error_message is not None
 
 
-def test_request_approval_workflow_limit_order(services):
-    """Test request_approval workflow with limit order."""
-    broker, simulator, risk_engine, approval_service = services
-    
-    intent = OrderIntent(
-        account_id="DU123456",
-        instrument=Instrument(
-            type=InstrumentType.STK,
-            symbol="AAPL",
-            exchange="SMART",
-            currency="USD",
-        ),
-        side="BUY",
-        quantity=Decimal("10"),
-        order_type="LMT",
-        limit_price=Decimal("185.00"),  # Below market
-        time_in_force="DAY",
-        reason="Buy on dip below current market price",
-        strategy_tag="mcp_request",
-        constraints={},
-    )
-    
-    portfolio = broker.get_portfolio("DU123456")
-    market_price = Decimal("190.00")
-    sim_result = simulator.simulate(intent, portfolio, market_price)
-    
-    assert sim_result.status == "SUCCESS"
-    
-    risk_decision = risk_engine.evaluate(intent, portfolio, sim_result)
-    assert risk_decision.decision == Decision.APPROVE
-    
-    proposal = approval_service.create_and_store_proposal(
-        intent=intent,
-        sim_result=sim_result,
-        risk_decision=risk_decision,
-    )
-    
-    # Verify limit order details
-    assert proposal.intent.order_type == "LMT"
-    assert proposal.intent.limit_price == Decimal("185.00")
-
-
 def test_approval_service_get_proposal(services):
     """Test ApprovalService.get_proposal functionality."""
     _, _, _, approval_service = services
@@ -224,32 +167,26 @@ def test_approval_service_get_proposal(services):
     assert result is None
 
 
-def test_approval_service_list_proposals(services):
+def test_approval_service_list_proposals(services, intent_factory):
     """Test ApprovalService.list_proposals functionality."""
     broker, simulator, risk_engine, approval_service = services
     
+    # Portfolio is not mutated by proposal creation, so one snapshot serves all
+    portfolio = broker.get_portfolio("DU123456")
+    
     # Create multiple proposals
     for i in range(3):
-        intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
+        intent = intent_factory(
+            instrument=Instrument.model_construct(
                 type=InstrumentType.STK,
                 symbol=f"STOCK{i}",
                 exchange="SMART",
                 currency="USD",
             ),
-            side="BUY",
-            quantity=Decimal("10"),
-            order_type="MKT",
-            limit_price=None,
-            time_in_force="DAY",
             reason=f"Test proposal {i} for list test",
-            strategy_tag="mcp_request",
-            constraints={},
         )
         
-        portfolio = broker.get_portfolio("DU123456")
-        sim_result = simulator.simulate(intent, portfolio, Decimal("100.00"))
+        sim_result = simulator.simulate(intent, portfolio, P100)
         risk_decision = risk_engine.evaluate(intent, portfolio, sim_result)
         
         proposal = approval_service.create_and_store_proposal(
@@ -264,3 +201,33 @@ def test_approval_service_list_proposals(services):
     assert len(proposals) >= 3
     assert all(p.state == "APPROVAL_REQUESTED" for p in proposals[:3])
 
+
+@pytest.fixture(scope="module")
+def valid_args():
+    """Valid request_approval tool arguments (copy before mutating)."""
+    return {
+        "account_id": "DU123456",
+        "symbol": "AAPL",
+        "side": "BUY",
+        "quantity": D10,
+        "market_price": P190,
+        "reason": "Portfolio rebalancing to target allocation",
+    }
+
+
+@pytest.mark.parametrize(
+    "overrides,loc",
+    [
+        pytest.param({"side": "buy"}, "side", id="side_lowercase"),
+        pytest.param({"quantity": QTY_NEG_100}, "quantity", id="quantity_negative"),
+        pytest.param({"reason": "Short"}, "reason", id="reason_too_short"),
+        pytest.param({"extra_field": "x"}, "extra_field", id="extra_field"),
+    ],
+)
+def test_request_approval_field_rules(valid_args, errs, overrides, loc):
+    """Test RequestApprovalSchema rejects each invalid field at its location."""
+    with pytest.raises(ValidationError) as exc_info:
+        RequestApprovalSchema.model_validate({**valid_args, **overrides})
+    
+    errors = errs(exc_info)
+    assert any(e["loc"] == (loc,) for e in errors)
@@ -10,32 +10,63 @@ Tests cover:
 
 import pytest
 from decimal import Decimal
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from packages.broker_ibkr.fake import FakeBrokerAdapter
 from packages.broker_ibkr.models import Instrument, InstrumentType, OrderStatus
 from packages.schemas.order_intent import OrderIntent
 from packages.schemas.order_cancel import OrderCancelIntent, OrderCancelResponse
 from packages.schemas.approval import ApprovalToken
 from packages.kill_switch import KillSwitch
+from packages.mcp_security.schemas import RequestCancelSchema
+from pydantic import ValidationError
+
+QTY_10 = Decimal("10")
+
+INSTRUMENT_AAPL = Instrument.model_construct(
+    type=InstrumentType.STK,
+    symbol="AAPL",
+    exchange="SMART",
+    currency="USD",
+)
+
+_TOKEN_CREATED_AT = datetime.now(timezone.utc)
+
+# Opaque to the fake broker (the caller validates tokens), so one instance
+# with a far-future expiry serves every submitted_order.
+APPROVAL_TOKEN = ApprovalToken.model_construct(
+    token_id="test_token",
+    proposal_id="test_proposal",
+    account_id="DU123456",
+    created_at=_TOKEN_CREATED_AT,
+    expires_at=_TOKEN_CREATED_AT + timedelta(days=365),
+    intent_hash="test_hash_12345",
+)
 
 
 @pytest.fixture
-def broker():
-    """Create fake broker for testing."""
-    broker = FakeBrokerAdapter(account_id="DU123456")
-    broker.connect()
+def broker(services):
+    """Shared session fake broker, restored to its pristine state for each test."""
+    broker, _, _, _ = services
     return broker
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def kill_switch():
-    """Create fresh kill switch for each test."""
-    ks = KillSwitch()
-    # Ensure it starts disabled
-    if ks.is_enabled():
-        ks.deactivate(deactivated_by="test_fixture")
-    return ks
+    """Kill switch singleton, shared for the whole session."""
+    return KillSwitch()
+
+
+@pytest.fixture(autouse=True)
+def _reset_kill_switch(kill_switch):
+    """Ensure each test starts with the kill switch disabled."""
+    if kill_switch.is_enabled():
+        kill_switch.deactivate(deactivated_by="test_fixture")
+
+
+@pytest.fixture
+def frozen_now():
+    """Single UTC timestamp shared by everything a test builds."""
+    return datetime.now(timezone.utc)
 
 
 @pytest.fixture
@@ -43,60 +74,44 @@ def submitted_order(broker):
     """Create a submitted order for cancellation tests."""
     intent = OrderIntent(
         account_id="DU123456",
-        instrument=Instrument(
-            type=InstrumentType.STK,
-            symbol="AAPL",
-            exchange="SMART",
-            currency="USD",
-        ),
+        instrument=INSTRUMENT_AAPL,
         side="BUY",
-        quantity=Decimal("10"),
+        quantity=QTY_10,
         order_type="MKT",
         time_in_force="DAY",
         reason="Test order for cancellation",
         strategy_tag="test_cancel",
     )
     
-    # Create proper approval token with all required fields
-    from datetime import timedelta
-    token = ApprovalToken(
-        token_id="test_token",
-        proposal_id="test_proposal",
-        account_id="DU123456",
-        created_at=datetime.now(timezone.utc),
-        expires_at=datetime.now(timezone.utc) + timedelta(minutes=5),
-        intent_hash="test_hash_12345",
-    )
-    
-    order = broker.submit_order(intent, token)
+    order = broker.submit_order(intent, APPROVAL_TOKEN)
     return order
 
 
-def test_cancel_intent_with_proposal_id():
-    """Test OrderCancelIntent with proposal_id."""
-    intent = OrderCancelIntent(
-        account_id="DU123456",
-        proposal_id="proposal_abc123",
-        broker_order_id=None,
-        reason="Market conditions changed significantly",
-    )
-    
-    assert intent.account_id == "DU123456"
-    assert intent.proposal_id == "proposal_abc123"
-    assert intent.broker_order_id is None
+@pytest.fixture(scope="module")
+def cancel_validator():
+    """Pre-built RequestCancelSchema core validator (skips BaseModel.__init__)."""
+    return RequestCancelSchema.__pydantic_validator__
 
 
-def test_cancel_intent_with_broker_order_id():
-    """Test OrderCancelIntent with broker_order_id."""
+@pytest.mark.parametrize(
+    "proposal_id,broker_order_id,reason",
+    [
+        pytest.param("proposal_abc123", None, "Market conditions changed significantly", id="proposal_id"),
+        pytest.param(None, "MOCK12345678", "User requested immediate cancellation", id="broker_order_id"),
+    ],
+)
+def test_cancel_intent_with_single_id(proposal_id, broker_order_id, reason):
+    """Test OrderCancelIntent with either proposal_id or broker_order_id."""
     intent = OrderCancelIntent(
         account_id="DU123456",
-        proposal_id=None,
-        broker_order_id="MOCK12345678",
-        reason="User requested immediate cancellation",
+        proposal_id=proposal_id,
+        broker_order_id=broker_order_id,
+        reason=reason,
     )
     
-    assert intent.broker_order_id == "MOCK12345678"
-    assert intent.proposal_id is None
+    assert intent.account_id == "DU123456"
+    assert intent.proposal_id == proposal_id
+    assert intent.broker_order_id == broker_order_id
 
 
 def test_kill_switch_activation(kill_switch):
@@ -147,7 +162,7 @@ def test_broker_cancel_nonexistent_order(broker):
     assert "not found" in str(exc_info.value).lower()
 
 
-def test_cancel_response_structure():
+def test_cancel_response_structure(frozen_now):
     """Test OrderCancelResponse structure."""
     response = OrderCancelResponse(
         approval_id="cancel_abc123def456",
@@ -155,7 +170,7 @@ def test_cancel_response_structure():
         broker_order_id=None,
         status="PENDING_APPROVAL",
         reason="Market changed",
-        requested_at=datetime.now(timezone.utc),
+        requested_at=frozen_now,
     )
     
     assert response.approval_id == "cancel_abc123def456"
@@ -163,70 +178,50 @@ def test_cancel_response_structure():
     assert response.status == "PENDING_APPROVAL"
 
 
-def test_mcp_schema_xor_validation():
-    """Test MCP RequestCancelSchema XOR validation."""
-    from packages.mcp_security.schemas import RequestCancelSchema
-    from pydantic import ValidationError
-    
+def test_mcp_schema_xor_validation(cancel_validator):
+    """Test MCP RequestCancelSchema accepts exactly one of the two IDs."""
     # Valid with proposal_id only
-    schema = RequestCancelSchema(
-        account_id="DU123456",
-        proposal_id="proposal_abc",
-        broker_order_id=None,
-        reason="Valid reason here that is long enough",
-    )
+    schema = cancel_validator.validate_python({
+        "account_id": "DU123456",
+        "proposal_id": "proposal_abc",
+        "broker_order_id": None,
+        "reason": "Valid reason here that is long enough",
+    })
     assert schema.proposal_id == "proposal_abc"
     
     # Valid with broker_order_id only
-    schema2 = RequestCancelSchema(
-        account_id="DU123456",
-        proposal_id=None,
-        broker_order_id="MOCK123",
-        reason="Valid reason here that is long enough",
-    )
+    schema2 = cancel_validator.validate_python({
+        "account_id": "DU123456",
+        "proposal_id": None,
+        "broker_order_id": "MOCK123",
+        "reason": "Valid reason here that is long enough",
+    })
     assert schema2.broker_order_id == "MOCK123"
-    
-    # Invalid - both missing (XOR validation should fail)
-    with pytest.raises(ValidationError):
-        RequestCancelSchema(
-            account_id="DU123456",
-            proposal_id=None,
-            broker_order_id=None,
-            reason="Should fail validation",
-        )
-
-
-def test_mcp_schema_reason_validation():
-    """Test reason field validation."""
-    from packages.mcp_security.schemas import RequestCancelSchema
-    from pydantic import ValidationError
-    
-    # Invalid - reason too short (min 10 chars)
-    with pytest.raises(ValidationError) as exc_info:
-        RequestCancelSchema(
-            account_id="DU123456",
-            proposal_id="proposal_abc",
-            broker_order_id=None,
-            reason="Short",
-        )
-    
-    errors = exc_info.value.errors()
-    assert any("reason" in str(e["loc"]) for e in errors)
 
 
-def test_mcp_schema_forbids_extra_fields():
-    """Test that RequestCancelSchema rejects unknown fields."""
-    from packages.mcp_security.schemas import RequestCancelSchema
-    from pydantic import ValidationError
-    
+VALID_CANCEL_ARGS = {
+    "account_id": "DU123456",
+    "proposal_id": "proposal_abc",
+    "broker_order_id": None,
+    "reason": "Valid reason here that is long enough",
+}
+
+
+@pytest.mark.parametrize(
+    "overrides,expected_loc",
+    [
+        # Both IDs missing (XOR validation should fail)
+        pytest.param({"proposal_id": None}, "broker_order_id", id="missing_ids"),
+        # Reason too short (min 10 chars)
+        pytest.param({"reason": "Short"}, "reason", id="short_reason"),
+        # Unknown fields are forbidden
+        pytest.param({"unknown_field": "should fail"}, "unknown_field", id="extra_field"),
+    ],
+)
+def test_mcp_schema_rejects_invalid_args(cancel_validator, errs, overrides, expected_loc):
+    """Test RequestCancelSchema rejects invalid arguments at the offending field."""
     with pytest.raises(ValidationError) as exc_info:
-        RequestCancelSchema(
-            account_id="DU123456",
-            proposal_id="proposal_abc",
-            broker_order_id=None,
-            reason="Valid reason here that is long enough",
-            unknown_field="should fail",
-        )
+        cancel_validator.validate_python({**VALID_CANCEL_ARGS, **overrides})
     
-    errors = exc_info.value.errors()
-    assert any("unknown_field" in str(e["loc"]) for e in errors)
+    errors = errs(exc_info)
+    assert any(e["loc"] == (expected_loc,) for e in errors)
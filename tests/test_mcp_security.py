@@ -1,12 +1,29 @@
 """Tests for MCP security modules: rate limiter, redactor, policy."""
 
+import dataclasses
 import pytest
-import time
+import re
+import threading
 from decimal import Decimal
 
 from packages.mcp_security.rate_limiter import RateLimiter, RateLimitConfig
+from packages.mcp_security import redactor as redactor_module
 from packages.mcp_security.redactor import OutputRedactor, RedactionConfig
 from packages.mcp_security.policy import ToolPolicy, ToolPolicyRule, ToolAction
+from packages.mcp_security import is_write_tool, list_allowed_tools, validate_tool_allowlist
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self, start: float = 1_000.0):
+        self.now = start
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
 
 
 class TestRateLimiter:
@@ -28,7 +45,7 @@ class TestRateLimiter:
         allowed, reason = limiter.check_rate_limit("get_portfolio", "session1")
         assert allowed is False
         assert "tool:get_portfolio" in reason
-        assert "per minute" in reason
+        assert "limit 2 per minute" in reason
     
     def test_per_session_limit(self):
         """Test per-session rate limiting."""
@@ -72,7 +89,8 @@ class TestRateLimiter:
             circuit_breaker_threshold=3,
             circuit_breaker_timeout=2  # 2 seconds for test
         )
-        limiter = RateLimiter(config)
+        clock = FakeClock()
+        limiter = RateLimiter(config, clock=clock)
         
         tool_name = "get_portfolio"
         session_id = "session1"
@@ -91,13 +109,56 @@ class TestRateLimiter:
         assert allowed is False
         assert "circuit breaker active" in reason.lower()
         
-        # Wait for circuit breaker to reset
-        time.sleep(2.5)
+        # Advance past the circuit breaker timeout
+        clock.advance(2.5)
         
-        # Should succeed again after timeout
-        allowed, _ = limiter.check_rate_limit(tool_name, session_id)
-        # Note: Will still hit per-minute limit, but no circuit breaker
-        # (Circuit breaker check passes, but per-minute limit still active)
+        # Circuit breaker check passes, but the per-minute limit is still active
+        allowed, reason = limiter.check_rate_limit(tool_name, session_id)
+        assert allowed is False
+        assert "circuit breaker" not in reason.lower()
+    
+    def test_tokens_refill_over_window(self):
+        """Test spent tokens come back gradually (token bucket refill)."""
+        clock = FakeClock()
+        config = RateLimitConfig(tool_calls_per_minute=60)  # 1 token per second
+        limiter = RateLimiter(config, clock=clock)
+        
+        # Full burst is available immediately
+        for _ in range(60):
+            allowed, _ = limiter.check_rate_limit("get_portfolio", "session1")
+            assert allowed is True
+        allowed, _ = limiter.check_rate_limit("get_portfolio", "session1")
+        assert allowed is False
+        assert limiter.get_stats()["tool:get_portfolio"]["calls_last_minute"] == 60
+        
+        # One second refills exactly one token
+        clock.advance(1.0)
+        allowed, _ = limiter.check_rate_limit("get_portfolio", "session1")
+        assert allowed is True
+        allowed, _ = limiter.check_rate_limit("get_portfolio", "session1")
+        assert allowed is False
+    
+    def test_concurrent_checks_respect_limit(self):
+        """Test concurrent callers never exceed a shared tool limit."""
+        config = RateLimitConfig(tool_calls_per_minute=100, circuit_breaker_threshold=10_000)
+        limiter = RateLimiter(config, clock=FakeClock())
+        allowed_count = [0]
+        count_lock = threading.Lock()
+        
+        def worker(session_id):
+            for _ in range(20):
+                allowed, _ = limiter.check_rate_limit("get_portfolio", session_id)
+                if allowed:
+                    with count_lock:
+                        allowed_count[0] += 1
+        
+        threads = [threading.Thread(target=worker, args=(f"session{i}",)) for i in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert allowed_count[0] == 100
     
     def test_reset_state(self):
         """Test resetting rate limiter state."""
@@ -145,6 +206,17 @@ class TestOutputRedactor:
         assert result["api_key"] == "***REDACTED***"
         assert result["ssn"] == "***REDACTED***"
     
+    def test_field_redaction_case_insensitive(self):
+        """Test field rules match regardless of key case."""
+        redactor = OutputRedactor()
+        
+        data = {"Password": "super_secret", "ACCOUNT_ID": "DU123456", "Symbol": "AAPL"}
+        result = redactor.redact(data)
+        
+        assert result["Password"] == "***REDACTED***"
+        assert result["ACCOUNT_ID"] == "******56"
+        assert result["Symbol"] == "AAPL"
+    
     def test_string_pattern_redaction(self):
         """Test regex-based string redaction."""
         redactor = OutputRedactor()
@@ -160,6 +232,22 @@ class TestOutputRedactor:
         assert "u***@example.com" in result
         assert "user@example.com" not in result
     
+    def test_mixed_patterns(self):
+        """Test every pattern applies within one string."""
+        redactor = OutputRedactor()
+        
+        text = "card 1234-5678-9012-3456 ssn 123-45-6789 acct U987654 API_KEY=abcdefgh12345"
+        result = redactor.redact(text)
+        
+        assert result == 'card ****-****-****-3456 ssn ***-**-6789 acct U****54 API_KEY="***"'
+    
+    def test_overlapping_patterns_all_apply(self):
+        """Test text inside one pattern's match is still checked by the others."""
+        redactor = OutputRedactor()
+        
+        assert redactor.redact("user@DU123456.com") == "user@DU****56.com"
+        assert redactor.redact("key: DU123456 x") == "key: DU****56 x"
+    
     def test_nested_dict_redaction(self):
         """Test redaction in nested dictionaries."""
         redactor = OutputRedactor()
@@ -192,6 +280,19 @@ class TestOutputRedactor:
         assert result["accounts"][0]["account_id"] == "******11"
         assert result["accounts"][1]["account_id"] == "******22"
     
+    def test_deeply_nested_redaction(self):
+        """Test nesting deeper than the recursion limit is redacted."""
+        redactor = OutputRedactor()
+        
+        data = {"account_id": "DU123456"}
+        for _ in range(2000):
+            data = {"child": [data]}
+        result = redactor.redact(data)
+        
+        for _ in range(2000):
+            result = result["child"][0]
+        assert result == {"account_id": "******56"}
+    
     def test_token_pattern_redaction(self):
         """Test token/key pattern redaction in strings."""
         redactor = OutputRedactor()
@@ -201,6 +302,46 @@ class TestOutputRedactor:
         
         assert 'token="***"' in result
         assert "abc123def456xyz789" not in result
+    
+    def test_re2_compiles_with_inline_flags_and_falls_back(self, monkeypatch):
+        """Test the RE2 branch keeps pattern flags and falls back on unsupported syntax."""
+        sources = []
+        
+        class FakeRe2:
+            error = re.error
+            
+            @staticmethod
+            def compile(source):
+                sources.append(source)
+                if "(?=" in source:
+                    raise FakeRe2.error("lookaround not supported")
+                return re.compile(source)
+        
+        monkeypatch.setattr(redactor_module, "re2", FakeRe2)
+        config = RedactionConfig()
+        lookahead = re.compile(r"internal(?=-host)")
+        config.patterns.append((lookahead, "***"))
+        redactor = OutputRedactor(config)
+        
+        token_source = config.patterns[1][0].pattern
+        assert f"(?i:{token_source})" in sources
+        assert redactor._patterns[-1][0] is lookahead
+        assert redactor.redact("API_KEY=abcdefgh12345 internal-host") == 'API_KEY="***" ***-host'
+    
+    def test_re2_matches_stdlib_on_default_patterns(self):
+        """Test RE2-compiled default patterns redact ASCII text like the stdlib engine."""
+        pytest.importorskip("re2")
+        redactor = OutputRedactor()
+        
+        for text in (
+            "card 1234-5678-9012-3456 ssn 123-45-6789 acct U987654 API_KEY=abcdefgh12345",
+            'Response: {"token":"abc123def456xyz789"} from user@example.com',
+            "user@DU123456.com and key: DU123456 x",
+        ):
+            expected = text
+            for pattern, replacement in RedactionConfig().patterns:
+                expected = pattern.sub(replacement, expected)
+            assert redactor.redact(text) == expected
 
 
 class TestToolPolicy:
@@ -214,6 +355,35 @@ class TestToolPolicy:
         allowed, _ = policy.check_tool_allowed("get_portfolio", "session1")
         assert allowed is True
     
+    def test_rules_are_immutable(self):
+        """Test rules can't be tightened behind the policy's precomputed tables."""
+        rule = ToolPolicyRule(
+            tool_name="get_portfolio",
+            action=ToolAction.ALLOW,
+            allowed_sessions={"session1"},
+            denied_parameters={"account"},
+        )
+        
+        assert isinstance(rule.allowed_sessions, frozenset)
+        assert rule.denied_parameters == frozenset({"account"})
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            rule.max_calls_per_session = 1
+    
+    def test_empty_constraints_are_not_unconstrained(self):
+        """Test empty session/parameter allowlists still restrict an ALLOW rule."""
+        policy = ToolPolicy(rules=[
+            ToolPolicyRule(tool_name="get_cash", action=ToolAction.ALLOW, allowed_sessions=set()),
+            ToolPolicyRule(
+                tool_name="get_positions", action=ToolAction.ALLOW, allowed_parameters=frozenset()
+            ),
+        ])
+        
+        allowed, _ = policy.check_tool_allowed("get_cash", "session1")
+        assert allowed is False
+        
+        allowed, _ = policy.check_tool_allowed("get_positions", "session1", {"account_id": "DU1"})
+        assert allowed is False
+    
     def test_deny_tool(self):
         """Test denying a tool by policy."""
         rule = ToolPolicyRule(tool_name="dangerous_tool", action=ToolAction.DENY)
@@ -347,5 +517,36 @@ class TestToolPolicy:
         assert stats["test_tool"] == 2
 
 
+class TestToolAllowlist:
+    """Test MCP tool allowlist helpers."""
+    
+    def test_list_allowed_tools(self):
+        """Test allowlist contents and order."""
+        tools = list_allowed_tools()
+        
+        assert tools[0] == "get_portfolio"
+        assert "request_approval" in tools
+        assert len(tools) == len(set(tools))
+        
+        # Callers get a fresh list they may mutate
+        tools.append("submit_order")
+        assert "submit_order" not in list_allowed_tools()
+    
+    def test_validate_tool_allowlist(self):
+        """Test allowlist validation for known and unknown tools."""
+        assert validate_tool_allowlist("get_portfolio") == (True, None)
+        
+        allowed, reason = validate_tool_allowlist("submit_order")
+        assert allowed is False
+        assert "not in allowlist" in reason
+        assert "get_portfolio" in reason
+    
+    def test_is_write_tool(self):
+        """Test only request_approval is classified as a write tool."""
+        assert is_write_tool("request_approval") is True
+        assert is_write_tool("get_portfolio") is False
+        assert is_write_tool("submit_order") is False
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
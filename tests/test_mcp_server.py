@@ -7,7 +7,10 @@ import pytest
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
+from mcp.types import TextContent
+
 from apps.mcp_server.main import (
+    _redact_content,
     emit_audit_event,
     handle_get_portfolio,
     handle_get_positions,
@@ -16,60 +19,87 @@ from apps.mcp_server.main import (
     handle_simulate_order,
     handle_evaluate_risk,
 )
+from packages.audit_store import AuditQuery, AuditStore
 from packages.broker_ibkr.fake import FakeBrokerAdapter
 from packages.broker_ibkr.models import Instrument, InstrumentType
+from packages.mcp_security.redactor import OutputRedactor
 from packages.risk_engine import RiskEngine, RiskLimits, TradingHours
 from packages.trade_sim import TradeSimulator, SimulationConfig
 
 
+@pytest.fixture(scope="module")
+def module_audit_store():
+    """In-memory audit store whose schema is created once per module."""
+    store = AuditStore(":memory:")
+    yield store
+    store.close()
+
+
+@pytest.fixture(scope="module")
+def module_broker():
+    """Connected fake broker (plus its pristine state), built once per module."""
+    broker = FakeBrokerAdapter(account_id="DU123456")
+    broker.connect()
+    return broker, broker.snapshot()
+
+
+@pytest.fixture(scope="module")
+def module_simulator():
+    """Trade simulator shared by the module (stateless between calls)."""
+    return TradeSimulator(config=SimulationConfig())
+
+
+@pytest.fixture(scope="module")
+def module_risk_engine():
+    """Risk engine shared by the module (evaluation does not mutate it)."""
+    return RiskEngine(
+        limits=RiskLimits(
+            max_notional=Decimal("100000"),
+            max_position_pct=Decimal("100.0"),
+        ),
+        trading_hours=TradingHours(allow_pre_market=True, allow_after_hours=True),
+        daily_trades_count=0,
+        daily_pnl=Decimal("0"),
+    )
+
+
 @pytest.fixture
-def mock_audit_store(tmp_path, monkeypatch):
-    """Mock audit store."""
-    from packages.audit_store import AuditStore
+def mock_audit_store(module_audit_store, monkeypatch):
+    """Mock audit store (module store, emptied for each test)."""
     import apps.mcp_server.main as mcp_main
     
-    store = AuditStore(str(tmp_path / "test_mcp_audit.db"))
-    monkeypatch.setattr(mcp_main, "audit_store", store)
-    return store
+    module_audit_store.reset()
+    monkeypatch.setattr(mcp_main, "audit_store", module_audit_store)
+    return module_audit_store
 
 
 @pytest.fixture
-def mock_broker(monkeypatch):
-    """Mock broker adapter."""
+def mock_broker(module_broker, monkeypatch):
+    """Mock broker adapter (module broker, restored for each test)."""
     import apps.mcp_server.main as mcp_main
     
-    broker = FakeBrokerAdapter(account_id="DU123456")
-    broker.connect()
+    broker, broker_state = module_broker
+    broker.restore(broker_state)
     monkeypatch.setattr(mcp_main, "broker", broker)
     return broker
 
 
 @pytest.fixture
-def mock_simulator(monkeypatch):
+def mock_simulator(module_simulator, monkeypatch):
     """Mock trade simulator."""
     import apps.mcp_server.main as mcp_main
     
-    simulator = TradeSimulator(config=SimulationConfig())
-    monkeypatch.setattr(mcp_main, "simulator", simulator)
-    return simulator
+    monkeypatch.setattr(mcp_main, "simulator", module_simulator)
+    return module_simulator
 
 
 @pytest.fixture
-def mock_risk_engine(monkeypatch):
+def mock_risk_engine(module_risk_engine, monkeypatch):
     """Mock risk engine."""
     import apps.mcp_server.main as mcp_main
     
-    engine = RiskEngine(
-        limits=RiskLimits(
-            max_notional=Decimal("100000"),
-            max_position_pct=Decimal("100.0"),
-        ),
-        trading_hours=TradingHours(allow_pre_market=True, allow_after_hours=True),
-        daily_trades_count=0,
-        daily_pnl=Decimal("0"),
-    )
-    monkeypatch.setattr(mcp_main, "risk_engine", engine)
-    return engine
+    monkeypatch.setattr(mcp_main, "risk_engine", module_risk_engine)
+    return module_risk_engine
 
 
 @pytest.mark.asyncio
@@ -96,6 +126,8 @@ async def test_get_portfolio_missing_account_id(mock_audit_store, mock_broker):
     data = json.loads(result[0].text)
     assert data["status"] == "VALIDATION_ERROR"
     assert "account_id" in data["error"]
+    assert data["validation_errors"][0]["loc"] == ["account_id"]
+    assert "input" not in data["validation_errors"][0]
 
 
 @pytest.mark.asyncio
@@ -216,7 +248,6 @@ async def test_evaluate_risk_reject(mock_audit_store, mock_broker, mock_simulato
 @pytest.mark.asyncio
 async def test_audit_event_emission(mock_audit_store, mock_broker):
     """Test that tool calls emit audit events."""
-    from packages.audit_store import AuditQuery
     
     # Call tool
     await handle_get_portfolio({"account_id": "DU123456"})
@@ -305,3 +336,19 @@ async def test_decimal_serialization(mock_audit_store, mock_broker):
     assert isinstance(data["total_value"], str)
     if data["positions"]:
         assert isinstance(data["positions"][0]["quantity"], str)
+
+
+def test_redact_content_preserves_wide_integers_and_nan():
+    """Test redaction keeps integers wider than 64 bits and NaN unchanged."""
+    result = [
+        TextContent(type="text", text='{"big": 1180591620717411303424, "ratio": NaN, "account_id": "DU123456"}'),
+        TextContent(type="text", text="Account DU123456"),
+    ]
+    
+    _redact_content(result, OutputRedactor())
+    
+    data = json.loads(result[0].text)
+    assert data["big"] == 2**70
+    assert data["ratio"] != data["ratio"]
+    assert data["account_id"] == "******56"
+    assert result[1].text == "Account DU****56"
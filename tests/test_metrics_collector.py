@@ -4,7 +4,12 @@ from decimal import Decimal
 
 import pytest
 
-from packages.metrics_collector import MetricsCollector, get_metrics_collector, set_metrics_collector
+from packages.metrics_collector import (
+    MAX_LATENCY_SAMPLES,
+    MetricsCollector,
+    get_metrics_collector,
+    set_metrics_collector,
+)
 
 
 class TestMetricsCollector:
@@ -62,6 +67,17 @@ class TestMetricsCollector:
         assert collector.submission_latencies[0] == 0.250
         assert collector.fill_latencies[0] == 1.500
     
+    def test_latency_samples_bounded(self):
+        """Test latency history keeps only the most recent samples."""
+        collector = MetricsCollector()
+        
+        for i in range(MAX_LATENCY_SAMPLES + 5):
+            collector.record_order_latency("submission", float(i))
+        
+        assert len(collector.submission_latencies) == MAX_LATENCY_SAMPLES
+        assert collector.submission_latencies[0] == 5.0
+        assert collector.submission_latencies[-1] == float(MAX_LATENCY_SAMPLES + 4)
+    
     def test_reset_daily_metrics(self):
         """Test resetting daily metrics."""
         collector = MetricsCollector()
@@ -131,6 +147,18 @@ class TestMetricsCollector:
         assert "ibkr_fill_latency_seconds_count 1" in output
         assert "quantile" in output
     
+    def test_export_prometheus_escapes_labels(self):
+        """Test label values are escaped per the Prometheus text format."""
+        collector = MetricsCollector()
+        
+        collector.increment_proposal_count('BRK"B', "RISK\\APPROVED")
+        collector.record_risk_rejection("R1\nR2")
+        
+        output = collector.export_prometheus()
+        
+        assert 'ibkr_proposal_total{symbol="BRK\\"B",state="RISK\\\\APPROVED"} 1' in output
+        assert 'ibkr_risk_rejection_total{rule="R1\\nR2"} 1' in output
+    
     def test_thread_safety(self):
         """Test thread safety of metrics collection."""
         import threading
@@ -151,6 +179,27 @@ class TestMetricsCollector:
         # Should have 1000 total increments (10 threads * 100 each)
         assert collector.proposal_count[("AAPL", "RISK_APPROVED")] == 1000
     
+    def test_thread_safety_distinct_keys(self):
+        """Test concurrent increments across keys on different stripes."""
+        import threading
+        
+        collector = MetricsCollector()
+        symbols = [f"SYM{i}" for i in range(10)]
+        
+        def increment(symbol):
+            for _ in range(100):
+                collector.increment_proposal_count(symbol, "RISK_APPROVED")
+                collector.record_risk_rejection("R1")
+        
+        threads = [threading.Thread(target=increment, args=(s,)) for s in symbols]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert all(collector.proposal_count[(s, "RISK_APPROVED")] == 100 for s in symbols)
+        assert collector.risk_rejection_count["R1"] == 1000
+    
     def test_prometheus_quantiles(self):
         """Test Prometheus quantile calculation."""
         collector = MetricsCollector()
@@ -169,6 +218,22 @@ class TestMetricsCollector:
         # Verify count and sum
         assert "ibkr_submission_latency_seconds_count 10" in output
         assert "ibkr_submission_latency_seconds_sum" in output
+    
+    def test_prometheus_quantiles_refresh_after_new_samples(self):
+        """Test cached sorted latencies are invalidated by new samples."""
+        collector = MetricsCollector()
+        collector.record_order_latency("fill", 0.5)
+        
+        first = collector.export_prometheus()
+        assert 'ibkr_fill_latency_seconds{quantile="0.5"} 0.5000' in first
+        assert 'ibkr_fill_latency_seconds{quantile="0.5"} 0.5000' in collector.export_prometheus()
+        
+        collector.record_order_latency("fill", 2.0)
+        collector.record_order_latency("fill", 3.0)
+        
+        output = collector.export_prometheus()
+        assert 'ibkr_fill_latency_seconds{quantile="0.5"} 2.0000' in output
+        assert "ibkr_fill_latency_seconds_count 3" in output
 
 
 class TestGlobalMetricsCollector:
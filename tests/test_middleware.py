@@ -4,6 +4,9 @@ This module contains tests for the FastAPI middleware that injects
 correlation IDs into requests and context.
 """
 
+import uuid
+from typing import Iterator
+
 import pytest
 from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
@@ -15,9 +18,9 @@ from packages.audit_store.middleware import (
 )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def app() -> FastAPI:
-    """Create test FastAPI app with middleware."""
+    """Create test FastAPI app with middleware (shared; tests don't mutate it)."""
     app = FastAPI()
     app.add_middleware(CorrelationIdMiddleware)
 
@@ -29,32 +32,35 @@ def app() -> FastAPI:
     return app
 
 
-@pytest.fixture
-def client(app: FastAPI) -> TestClient:
-    """Create test client."""
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def client(app: FastAPI) -> Iterator[TestClient]:
+    """Create test client, entering the app lifespan once for the module."""
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 class TestCorrelationIdMiddleware:
     """Tests for CorrelationIdMiddleware."""
 
-    def test_generates_correlation_id_when_not_provided(
-        self, client: TestClient
-    ) -> None:
-        """Test middleware generates correlation ID when not provided."""
-        response = client.get("/test")
-        assert response.status_code == 200
+    def test_generation_and_isolation(self, client: TestClient) -> None:
+        """Test middleware generates a distinct correlation ID per request."""
+        responses = [client.get("/test") for _ in range(3)]
 
-        # Response should have correlation ID header
-        assert "x-correlation-id" in response.headers
-        correlation_id = response.headers["x-correlation-id"]
+        correlation_ids = set()
+        for response in responses:
+            assert response.status_code == 200
 
-        # Should be valid UUID
-        assert len(correlation_id) == 36  # UUID format
-        assert correlation_id.count("-") == 4
+            # Response should have a UUID correlation ID header
+            correlation_id = response.headers["x-correlation-id"]
+            # Parses as a UUID (raises otherwise) and is in canonical form
+            assert str(uuid.UUID(correlation_id)) == correlation_id
 
-        # Endpoint should receive same correlation ID
-        assert response.json()["correlation_id"] == correlation_id
+            # Endpoint should receive same correlation ID
+            assert response.json()["correlation_id"] == correlation_id
+            correlation_ids.add(correlation_id)
+
+        # IDs are isolated between requests
+        assert len(correlation_ids) == 3
 
     def test_uses_provided_correlation_id(self, client: TestClient) -> None:
         """Test middleware uses correlation ID from header."""
@@ -71,21 +77,6 @@ class TestCorrelationIdMiddleware:
         # Endpoint should receive same correlation ID
         assert response.json()["correlation_id"] == custom_id
 
-    def test_correlation_id_isolated_per_request(
-        self, client: TestClient
-    ) -> None:
-        """Test correlation IDs are isolated between requests."""
-        # Make first request
-        response1 = client.get("/test")
-        id1 = response1.headers["x-correlation-id"]
-
-        # Make second request
-        response2 = client.get("/test")
-        id2 = response2.headers["x-correlation-id"]
-
-        # IDs should be different
-        assert id1 != id2
-
 
 class TestCorrelationIdContext:
     """Tests for correlation ID context functions."""
@@ -98,6 +89,4 @@ class TestCorrelationIdContext:
 
     def test_get_correlation_id_returns_empty_when_not_set(self) -> None:
         """Test get returns empty string when not set."""
-        # Reset context
-        set_correlation_id("")
         assert get_correlation_id() == ""
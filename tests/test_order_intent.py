@@ -1,6 +1,7 @@
 """Tests for OrderIntent schema validation."""
 
 from decimal import Decimal
+from types import MappingProxyType
 
 import pytest
 from pydantic import ValidationError
@@ -15,6 +16,71 @@ from packages.broker_ibkr import (
 from packages.schemas import OrderConstraints, OrderIntent
 
 
+# Literal values parsed once per module
+ACCOUNT_ID = "DU123456"
+QTY_100 = Decimal("100")
+QTY_50 = Decimal("50")
+QTY_25 = Decimal("25")
+QTY_75 = Decimal("75")
+QTY_200 = Decimal("200")
+QTY_0 = Decimal("0")
+QTY_NEG_100 = Decimal("-100")
+PRICE_180_50 = Decimal("180.50")
+PRICE_200 = Decimal("200.00")
+PRICE_350 = Decimal("350.00")
+PRICE_355 = Decimal("355.00")
+NOTIONAL_10000 = Decimal("10000.00")
+NOTIONAL_50000 = Decimal("50000.00")
+NOTIONAL_NEG_100 = Decimal("-100.00")
+LIQUIDITY_1M = Decimal("1000000.00")
+
+# One character past the 500-char reason limit (the minimal rejected input)
+LONG_REASON_501 = "x" * 501
+
+
+def _stock(symbol: str) -> Instrument:
+    """US stock routed via SMART."""
+    return Instrument(type=InstrumentType.STK, symbol=symbol, exchange="SMART", currency="USD")
+
+
+@pytest.fixture(scope="module")
+def spy_stk() -> Instrument:
+    """SPY stock, built once per module (instruments are immutable)."""
+    return _stock("SPY")
+
+
+@pytest.fixture(scope="module")
+def aapl_stk() -> Instrument:
+    """AAPL stock, built once per module (instruments are immutable)."""
+    return _stock("AAPL")
+
+
+@pytest.fixture(scope="module")
+def tsla_stk() -> Instrument:
+    """TSLA stock, built once per module (instruments are immutable)."""
+    return _stock("TSLA")
+
+
+@pytest.fixture(scope="module")
+def msft_stk() -> Instrument:
+    """MSFT stock, built once per module (instruments are immutable)."""
+    return _stock("MSFT")
+
+
+@pytest.fixture(scope="module")
+def valid_intent_kwargs(spy_stk):
+    """Baseline-valid SPY market order arguments, read-only; tests override via {**kwargs, ...}."""
+    return MappingProxyType({
+        "account_id": ACCOUNT_ID,
+        "instrument": spy_stk,
+        "side": OrderSide.BUY,
+        "quantity": QTY_100,
+        "order_type": OrderType.MKT,
+        "reason": "Buy SPY for index exposure",
+        "strategy_tag": "test",
+    })
+
+
 class TestOrderConstraints:
     """Test cases for OrderConstraints model."""
     
@@ -22,114 +88,80 @@ class TestOrderConstraints:
         """Test valid constraint creation."""
         constraints = OrderConstraints(
             max_slippage_bps=50,
-            max_notional=Decimal("10000.00"),
-            min_liquidity=Decimal("1000000.00"),
+            max_notional=NOTIONAL_10000,
+            min_liquidity=LIQUIDITY_1M,
             execution_window_minutes=30,
         )
         
         assert constraints.max_slippage_bps == 50
-        assert constraints.max_notional == Decimal("10000.00")
-        assert constraints.min_liquidity == Decimal("1000000.00")
+        assert constraints.max_notional == NOTIONAL_10000
+        assert constraints.min_liquidity == LIQUIDITY_1M
         assert constraints.execution_window_minutes == 30
     
-    def test_negative_slippage_fails(self):
-        """Test that negative slippage is rejected."""
+    @pytest.mark.parametrize("field,value,message", [
+        pytest.param("max_slippage_bps", -10, "greater than or equal to 0", id="negative_slippage"),
+        pytest.param("max_slippage_bps", 5000, "less than or equal to 1000", id="excessive_slippage"),
+        pytest.param("max_notional", NOTIONAL_NEG_100, "greater than 0", id="negative_notional"),
+    ])
+    def test_invalid_constraint_fails(self, errs, field, value, message):
+        """Test that out-of-range constraint values are rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            OrderConstraints(max_slippage_bps=-10)
+            OrderConstraints(**{field: value})
         
-        errors = exc_info.value.errors()
-        assert any(
-            e["loc"] == ("max_slippage_bps",) and "greater than or equal to 0" in str(e)
-            for e in errors
-        )
-    
-    def test_excessive_slippage_fails(self):
-        """Test that excessive slippage is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            OrderConstraints(max_slippage_bps=5000)
-        
-        errors = exc_info.value.errors()
-        assert any(
-            e["loc"] == ("max_slippage_bps",) and "less than or equal to 1000" in str(e)
-            for e in errors
-        )
-    
-    def test_negative_notional_fails(self):
-        """Test that negative notional is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            OrderConstraints(max_notional=Decimal("-100.00"))
-        
-        errors = exc_info.value.errors()
-        assert any(
-            e["loc"] == ("max_notional",) and "greater than 0" in str(e)
-            for e in errors
-        )
+        errors = errs(exc_info)
+        assert errors[0]["loc"] == (field,)
+        assert message in errors[0]["msg"]
 
 
 class TestOrderIntent:
     """Test cases for OrderIntent model."""
     
-    def test_valid_market_order(self):
+    def test_valid_market_order(self, spy_stk):
         """Test valid market order creation."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="SPY",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=spy_stk,
             side=OrderSide.BUY,
-            quantity=Decimal("100"),
+            quantity=QTY_100,
             order_type=OrderType.MKT,
             time_in_force=TimeInForce.DAY,
             reason="Buy SPY to increase portfolio exposure to S&P 500 index",
             strategy_tag="momentum_long",
         )
         
-        assert intent.account_id == "DU123456"
+        assert intent.account_id == ACCOUNT_ID
         assert intent.instrument.symbol == "SPY"
         assert intent.side == OrderSide.BUY
-        assert intent.quantity == Decimal("100")
+        assert intent.quantity == QTY_100
         assert intent.order_type == OrderType.MKT
         assert intent.limit_price is None
         assert intent.stop_price is None
     
-    def test_valid_limit_order(self):
+    def test_valid_limit_order(self, aapl_stk):
         """Test valid limit order with required price."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="AAPL",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=aapl_stk,
             side=OrderSide.SELL,
-            quantity=Decimal("50"),
+            quantity=QTY_50,
             order_type=OrderType.LMT,
-            limit_price=Decimal("180.50"),
+            limit_price=PRICE_180_50,
             time_in_force=TimeInForce.GTC,
             reason="Sell AAPL at target price to take profit",
             strategy_tag="mean_reversion",
         )
         
         assert intent.order_type == OrderType.LMT
-        assert intent.limit_price == Decimal("180.50")
+        assert intent.limit_price == PRICE_180_50
     
-    def test_limit_order_without_price_fails(self):
+    def test_limit_order_without_price_fails(self, aapl_stk, errs):
         """Test that limit order without limit_price is rejected."""
         with pytest.raises(ValidationError) as exc_info:
             OrderIntent(
-                account_id="DU123456",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="AAPL",
-                    exchange="SMART",
-                    currency="USD",
-                ),
+                account_id=ACCOUNT_ID,
+                instrument=aapl_stk,
                 side=OrderSide.BUY,
-                quantity=Decimal("50"),
+                quantity=QTY_50,
                 order_type=OrderType.LMT,
                 # Missing limit_price
                 time_in_force=TimeInForce.DAY,
@@ -137,119 +169,60 @@ class TestOrderIntent:
                 strategy_tag="limit_entry",
             )
         
-        errors = exc_info.value.errors()
-        assert any(
-            "limit_price" in str(e) and "required" in str(e).lower()
-            for e in errors
-        )
+        errors = errs(exc_info)
+        # Raised by the model validator, so the error has no field location
+        assert "limit_price" in errors[0]["msg"]
+        assert "required" in errors[0]["msg"].lower()
     
-    def test_stop_order_with_required_price(self):
+    def test_stop_order_with_required_price(self, tsla_stk):
         """Test stop order requires stop_price."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="TSLA",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=tsla_stk,
             side=OrderSide.SELL,
-            quantity=Decimal("25"),
+            quantity=QTY_25,
             order_type=OrderType.STP,
-            stop_price=Decimal("200.00"),
+            stop_price=PRICE_200,
             time_in_force=TimeInForce.DAY,
             reason="Stop loss trigger at support level to protect capital",
             strategy_tag="risk_management",
         )
         
-        assert intent.stop_price == Decimal("200.00")
+        assert intent.stop_price == PRICE_200
     
-    def test_stop_limit_order_requires_both_prices(self):
+    def test_stop_limit_order_requires_both_prices(self, msft_stk):
         """Test stop-limit order requires both prices."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="MSFT",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=msft_stk,
             side=OrderSide.BUY,
-            quantity=Decimal("75"),
+            quantity=QTY_75,
             order_type=OrderType.STP_LMT,
-            stop_price=Decimal("350.00"),
-            limit_price=Decimal("355.00"),
+            stop_price=PRICE_350,
+            limit_price=PRICE_355,
             time_in_force=TimeInForce.GTC,
             reason="Buy MSFT above resistance with limit protection against excessive slippage",
             strategy_tag="breakout_entry",
         )
         
-        assert intent.stop_price == Decimal("350.00")
-        assert intent.limit_price == Decimal("355.00")
+        assert intent.stop_price == PRICE_350
+        assert intent.limit_price == PRICE_355
     
-    def test_empty_account_id_fails(self):
+    def test_empty_account_id_fails(self, valid_intent_kwargs, errs):
         """Test that empty account_id is rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            OrderIntent(
-                account_id="",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="SPY",
-                    exchange="SMART",
-                    currency="USD",
-                ),
-                side=OrderSide.BUY,
-                quantity=Decimal("100"),
-                order_type=OrderType.MKT,
-                reason="Buy SPY for index exposure",
-                strategy_tag="test",
-            )
+            OrderIntent(**{**valid_intent_kwargs, "account_id": ""})
         
-        errors = exc_info.value.errors()
-        # Print for debugging
-        print("\nErrors:", errors)
-        assert any(
-            "account_id" in str(e)
-            for e in errors
-        )
+        errors = errs(exc_info)
+        assert errors[0]["loc"] == ("account_id",)
     
-    def test_short_reason_fails(self):
-        """Test that reason with < 10 characters is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            OrderIntent(
-                account_id="DU123456",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="SPY",
-                    exchange="SMART",
-                    currency="USD",
-                ),
-                side=OrderSide.BUY,
-                quantity=Decimal("100"),
-                order_type=OrderType.MKT,
-                reason="Buy now",  # Only 7 chars, < 10
-                strategy_tag="test",
-            )
-        
-        errors = exc_info.value.errors()
-        # Either min_length constraint (10 chars) or word count validator (3 words)
-        assert any(
-            "reason" in str(e["loc"]) and ("10" in str(e) or "3" in str(e))
-            for e in errors
-        )
-    
-    def test_reason_with_10_chars_passes(self):
+    def test_reason_with_10_chars_passes(self, spy_stk):
         """Test that reason with exactly 10 chars passes."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="SPY",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=spy_stk,
             side=OrderSide.BUY,
-            quantity=Decimal("100"),
+            quantity=QTY_100,
             order_type=OrderType.MKT,
             reason="Buy now urgently",  # 10+ chars, 3 words
             strategy_tag="test",
@@ -257,97 +230,34 @@ class TestOrderIntent:
         
         assert len(intent.reason) >= 10
     
-    def test_long_reason_truncated(self):
-        """Test that excessively long reason is rejected."""
-        long_reason = "Buy " * 200  # Will exceed 500 chars
-        
-        with pytest.raises(ValidationError) as exc_info:
-            OrderIntent(
-                account_id="DU123456",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="SPY",
-                    exchange="SMART",
-                    currency="USD",
-                ),
-                side=OrderSide.BUY,
-                quantity=Decimal("100"),
-                order_type=OrderType.MKT,
-                reason=long_reason,
-                strategy_tag="test",
-            )
-        
-        errors = exc_info.value.errors()
-        assert any(
-            "reason" in str(e) and "500" in str(e)
-            for e in errors
-        )
-    
-    def test_zero_quantity_fails(self):
-        """Test that zero quantity is rejected."""
-        with pytest.raises(ValidationError) as exc_info:
-            OrderIntent(
-                account_id="DU123456",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="SPY",
-                    exchange="SMART",
-                    currency="USD",
-                ),
-                side=OrderSide.BUY,
-                quantity=Decimal("0"),
-                order_type=OrderType.MKT,
-                reason="Buy SPY for exposure",
-                strategy_tag="test",
-            )
-        
-        errors = exc_info.value.errors()
-        assert any(
-            e["loc"] == ("quantity",) and "greater than 0" in str(e)
-            for e in errors
-        )
-    
-    def test_negative_quantity_fails(self):
-        """Test that negative quantity is rejected."""
+    @pytest.mark.parametrize("field,value,message", [
+        # Either min_length constraint (10 chars) or word count validator (3 words)
+        pytest.param("reason", "Buy now", "10", id="short_reason"),
+        pytest.param("reason", LONG_REASON_501, "500", id="long_reason"),
+        pytest.param("quantity", QTY_0, "greater than 0", id="zero_quantity"),
+        pytest.param("quantity", QTY_NEG_100, "greater than 0", id="negative_quantity"),
+    ])
+    def test_invalid_field_fails(self, valid_intent_kwargs, errs, field, value, message):
+        """Test that an otherwise valid order with one bad field is rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            OrderIntent(
-                account_id="DU123456",
-                instrument=Instrument(
-                    type=InstrumentType.STK,
-                    symbol="SPY",
-                    exchange="SMART",
-                    currency="USD",
-                ),
-                side=OrderSide.BUY,
-                quantity=Decimal("-100"),
-                order_type=OrderType.MKT,
-                reason="Buy SPY for exposure",
-                strategy_tag="test",
-            )
+            OrderIntent(**{**valid_intent_kwargs, field: value})
         
-        errors = exc_info.value.errors()
-        assert any(
-            e["loc"] == ("quantity",) and "greater than 0" in str(e)
-            for e in errors
-        )
+        errors = errs(exc_info)
+        assert errors[0]["loc"] == (field,)
+        assert message in errors[0]["msg"]
     
-    def test_order_with_constraints(self):
+    def test_order_with_constraints(self, spy_stk):
         """Test order with constraints."""
         constraints = OrderConstraints(
             max_slippage_bps=30,
-            max_notional=Decimal("50000.00"),
+            max_notional=NOTIONAL_50000,
         )
         
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="SPY",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=spy_stk,
             side=OrderSide.BUY,
-            quantity=Decimal("100"),
+            quantity=QTY_100,
             order_type=OrderType.MKT,
             reason="Buy SPY with slippage protection enabled",
             strategy_tag="protected_entry",
@@ -356,24 +266,19 @@ class TestOrderIntent:
         
         assert intent.constraints is not None
         assert intent.constraints.max_slippage_bps == 30
-        assert intent.constraints.max_notional == Decimal("50000.00")
+        assert intent.constraints.max_notional == NOTIONAL_50000
     
-    def test_immutability(self):
+    def test_immutability(self, spy_stk):
         """Test that OrderIntent is frozen (immutable)."""
         intent = OrderIntent(
-            account_id="DU123456",
-            instrument=Instrument(
-                type=InstrumentType.STK,
-                symbol="SPY",
-                exchange="SMART",
-                currency="USD",
-            ),
+            account_id=ACCOUNT_ID,
+            instrument=spy_stk,
             side=OrderSide.BUY,
-            quantity=Decimal("100"),
+            quantity=QTY_100,
             order_type=OrderType.MKT,
             reason="Buy SPY for index exposure",
             strategy_tag="test",
         )
         
         with pytest.raises(ValidationError):
-            intent.quantity = Decimal("200")  # Should fail
+            intent.quantity = QTY_200  # Should fail
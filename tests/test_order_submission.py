@@ -7,7 +7,8 @@ and broker integration.
 
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-import json
+import itertools
+import orjson
 import pytest
 import uuid
 
@@ -19,6 +20,14 @@ from packages.order_submission import OrderSubmitter, OrderSubmissionError
 from packages.schemas.approval import OrderState, OrderProposal, ApprovalToken
 
 
+_corr_counter = itertools.count()
+
+
+def _corr() -> str:
+    """Cheap, deterministic correlation ID (no CSPRNG read like uuid4)."""
+    return f"corr_{next(_corr_counter):08x}"
+
+
 # Fixtures
 
 @pytest.fixture
@@ -66,14 +75,14 @@ def sample_intent_json():
         "strategy_tag": "test",
         "constraints": {},
     }
-    return json.dumps(intent, sort_keys=True)
+    return orjson.dumps(intent, option=orjson.OPT_SORT_KEYS).decode()
 
 
 @pytest.fixture
 def approved_proposal_with_token(approval_service, sample_intent_json):
     """Create proposal in APPROVAL_GRANTED state with token."""
     proposal_id = str(uuid.uuid4())
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     
     # Create proposal in RISK_APPROVED state
     proposal = OrderProposal(
@@ -105,7 +114,7 @@ def approved_proposal_with_token(approval_service, sample_intent_json):
 def test_submit_order_success(order_submitter, approved_proposal_with_token):
     """Test successful order submission."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit order
@@ -127,7 +136,7 @@ def test_submit_order_success(order_submitter, approved_proposal_with_token):
 def test_submit_order_validates_token(order_submitter, approved_proposal_with_token):
     """Test submission fails with invalid token."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Try to submit with wrong token
@@ -143,7 +152,7 @@ def test_submit_order_validates_token(order_submitter, approved_proposal_with_to
 def test_submit_order_consumes_token(order_submitter, approval_service, approved_proposal_with_token):
     """Test token is consumed after submission."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit order
@@ -164,7 +173,7 @@ def test_submit_order_consumes_token(order_submitter, approval_service, approved
 def test_submit_order_cannot_reuse_token(order_submitter, approval_service, approved_proposal_with_token):
     """Test cannot submit order twice with same token."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # First submission succeeds
@@ -191,7 +200,7 @@ def test_submit_order_cannot_reuse_token(order_submitter, approval_service, appr
 def test_submit_order_transitions_to_submitted(order_submitter, approval_service, approved_proposal_with_token):
     """Test proposal transitions to SUBMITTED state."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit order
@@ -214,13 +223,13 @@ def test_submit_order_requires_approval_granted(order_submitter, approval_servic
     proposal_id = str(uuid.uuid4())
     proposal = OrderProposal(
         proposal_id=proposal_id,
-        correlation_id=str(uuid.uuid4()),
+        correlation_id=_corr(),
         intent_json=sample_intent_json,
         state=OrderState.APPROVAL_REQUESTED,
     )
     approval_service.store_proposal(proposal)
     
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Try to submit
@@ -233,10 +242,37 @@ def test_submit_order_requires_approval_granted(order_submitter, approval_servic
         )
 
 
+def test_proposal_intent_is_parsed_once(approved_proposal_with_token):
+    """Test the parsed intent is cached per proposal and not carried over."""
+    proposal, _ = approved_proposal_with_token
+    
+    assert proposal.intent is proposal.intent
+    assert proposal.intent.instrument.symbol == "AAPL"
+    assert "intent" not in proposal.model_dump()
+    
+    updated = proposal.with_state(OrderState.SUBMITTED)
+    assert updated.intent is not proposal.intent
+    assert updated.intent == proposal.intent
+
+
+def test_proposal_copy_reparses_updated_intent(approved_proposal_with_token):
+    """Test model_copy() does not carry over a stale cached intent."""
+    proposal, _ = approved_proposal_with_token
+    assert proposal.intent.instrument.symbol == "AAPL"
+    
+    msft_intent = proposal.intent.model_copy(
+        update={"instrument": proposal.intent.instrument.model_copy(update={"symbol": "MSFT"})}
+    )
+    copied = proposal.model_copy(update={"intent_json": msft_intent.model_dump_json()})
+    
+    assert copied.intent.instrument.symbol == "MSFT"
+    assert proposal.model_copy().intent is not proposal.intent
+
+
 def test_submit_order_emits_audit_events(order_submitter, audit_store, approved_proposal_with_token):
     """Test submission emits audit events."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit order
@@ -266,7 +302,7 @@ def test_submit_order_emits_audit_events(order_submitter, audit_store, approved_
 def test_poll_order_until_filled(order_submitter, broker, approval_service, approved_proposal_with_token):
     """Test polling order until FILLED state."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit order
@@ -302,7 +338,7 @@ def test_poll_order_until_filled(order_submitter, broker, approval_service, appr
 def test_poll_order_emits_terminal_event(order_submitter, audit_store, broker, approved_proposal_with_token):
     """Test polling emits terminal event."""
     proposal, token = approved_proposal_with_token
-    correlation_id = str(uuid.uuid4())
+    correlation_id = _corr()
     current_time = datetime.now(timezone.utc)
     
     # Submit and fill